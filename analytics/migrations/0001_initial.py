@@ -0,0 +1,46 @@
+# Generated by Django 4.0.4 on 2026-10-18 10:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('books', '0005_book_loan_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCirculation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('borrows', models.PositiveIntegerField(default=0)),
+                ('returns', models.PositiveIntegerField(default=0)),
+                ('loan_duration', models.DurationField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyBookCirculation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('borrows', models.PositiveIntegerField()),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='books.book')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailybookcirculation',
+            constraint=models.UniqueConstraint(fields=('day', 'book'), name='daily_book_circulation_unique'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+
+from books.models import Book
+
+
+class DailyCirculation(models.Model):
+    """Borrowings started and returned on one day (UTC)."""
+    day = models.DateField(unique=True)
+    borrows = models.PositiveIntegerField(default=0)
+    returns = models.PositiveIntegerField(default=0)
+    # Summed over the loans returned that day.
+    loan_duration = models.DurationField()
+
+
+class DailyBookCirculation(models.Model):
+    day = models.DateField()
+    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    borrows = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "book"],
+                                    name="daily_book_circulation_unique"),
+        ]
+
+
+class RollupState(models.Model):
+    name = models.CharField(max_length=50, primary_key=True)
+    # Start of the last successful refresh.
+    refreshed_at = models.DateTimeField()
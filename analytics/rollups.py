@@ -0,0 +1,130 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from analytics.models import (
+    DailyBookCirculation,
+    DailyCirculation,
+    RollupState,
+)
+from borrowings.models import Borrowing
+
+STATE_NAME = "circulation"
+# Rows saved by transactions still in flight when the previous refresh
+# started carry an earlier updated_at, so look back a little further.
+OVERLAP = timedelta(minutes=5)
+DAYS_PER_BATCH = 31
+
+
+def changed_days(since=None):
+    """Days whose borrows or returns changed since ``since`` (all days if
+    it is None), found through the index on ``Borrowing.updated_at``."""
+    changed = Borrowing.objects.order_by()
+    if since is not None:
+        changed = changed.filter(updated_at__gte=since)
+
+    days = set(
+        changed.annotate(day=TruncDate("borrow_date"))
+        .values_list("day", flat=True).distinct()
+    )
+    days.update(
+        changed.filter(actual_return_date__isnull=False)
+        .annotate(day=TruncDate("actual_return_date"))
+        .values_list("day", flat=True).distinct()
+    )
+    return days
+
+
+def day_range(field, days):
+    """Filter for ``field`` falling on one of ``days``, with an indexable
+    range around them."""
+    start = timezone.make_aware(datetime.combine(min(days), time.min))
+    end = timezone.make_aware(
+        datetime.combine(max(days) + timedelta(days=1), time.min)
+    )
+    return {
+        f"{field}__gte": start,
+        f"{field}__lt": end,
+        f"{field}__date__in": days,
+    }
+
+
+def rebuild_days(days):
+    """Recompute the rollups of ``days`` from borrowings, replacing the
+    existing rows."""
+    borrowed = Borrowing.objects.order_by().filter(
+        **day_range("borrow_date", days)
+    ).annotate(day=TruncDate("borrow_date"))
+    returned = Borrowing.objects.order_by().filter(
+        **day_range("actual_return_date", days)
+    ).annotate(day=TruncDate("actual_return_date"))
+
+    borrows = dict(
+        borrowed.values("day").annotate(count=Count("id"))
+        .values_list("day", "count")
+    )
+    returns = {
+        row["day"]: row for row in returned.values("day").annotate(
+            count=Count("id"),
+            duration=Sum(ExpressionWrapper(
+                F("actual_return_date") - F("borrow_date"),
+                output_field=DurationField(),
+            )),
+        )
+    }
+    book_borrows = borrowed.values("day", "book_id").annotate(
+        count=Count("id")
+    )
+
+    with transaction.atomic():
+        DailyCirculation.objects.filter(day__in=days).delete()
+        DailyBookCirculation.objects.filter(day__in=days).delete()
+
+        DailyCirculation.objects.bulk_create([
+            DailyCirculation(
+                day=day,
+                borrows=borrows.get(day, 0),
+                returns=returns[day]["count"] if day in returns else 0,
+                loan_duration=(returns[day]["duration"] if day in returns
+                               else timedelta()),
+            )
+            for day in sorted(borrows.keys() | returns.keys())
+        ])
+        DailyBookCirculation.objects.bulk_create(
+            [
+                DailyBookCirculation(day=row["day"], book_id=row["book_id"],
+                                     borrows=row["count"])
+                for row in book_borrows
+            ],
+            batch_size=1000,
+        )
+
+
+def refresh_rollups(full=False):
+    """Bring the rollups up to date and return the days that were rebuilt.
+
+    Only days touched by borrowings saved since the previous refresh are
+    recomputed; ``full`` rebuilds every day. Deleted borrowings are not
+    tracked, a full refresh picks them up.
+    """
+    started_at = timezone.now()
+    state = RollupState.objects.filter(name=STATE_NAME).first()
+
+    if full or state is None:
+        days = changed_days()
+        DailyCirculation.objects.exclude(day__in=days).delete()
+        DailyBookCirculation.objects.exclude(day__in=days).delete()
+    else:
+        days = changed_days(state.refreshed_at - OVERLAP)
+
+    days = sorted(days)
+    for start in range(0, len(days), DAYS_PER_BATCH):
+        rebuild_days(days[start:start + DAYS_PER_BATCH])
+
+    RollupState.objects.update_or_create(
+        name=STATE_NAME, defaults={"refreshed_at": started_at}
+    )
+    return days
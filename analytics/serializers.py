@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366 * 5
+
+
+class DateRangeSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("end", timezone.now().date())
+        attrs.setdefault("start",
+                         attrs["end"] - timedelta(days=DEFAULT_DAYS - 1))
+
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                {"start": "The start date cannot be after the end date."}
+            )
+        if (attrs["end"] - attrs["start"]).days >= MAX_DAYS:
+            raise serializers.ValidationError(
+                f"The range cannot be longer than {MAX_DAYS} days."
+            )
+
+        return attrs
+
+
+class BorrowsQuerySerializer(DateRangeSerializer):
+    period = serializers.ChoiceField(choices=("day", "week"), default="day")
+
+
+class TopBooksQuerySerializer(DateRangeSerializer):
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class CirculationSerializer(serializers.Serializer):
+    borrows = serializers.IntegerField()
+    returns = serializers.IntegerField()
+    average_loan_days = serializers.FloatField(allow_null=True)
+
+
+class PeriodCirculationSerializer(CirculationSerializer):
+    period = serializers.DateField()
+
+
+class TopBookSerializer(serializers.Serializer):
+    book_id = serializers.IntegerField()
+    title = serializers.CharField()
+    author = serializers.CharField()
+    borrows = serializers.IntegerField()
@@ -0,0 +1,175 @@
+import io
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from analytics.models import DailyBookCirculation, DailyCirculation
+from analytics.rollups import refresh_rollups
+from books.tests.factories import sample_book
+from borrowings.models import Borrowing
+
+BORROWS_URL = reverse("analytics:analytics-borrows")
+TOP_BOOKS_URL = reverse("analytics:analytics-top-books")
+SUMMARY_URL = reverse("analytics:analytics-summary")
+
+
+def at(day, hour=12):
+    return timezone.make_aware(datetime(2024, 3, day, hour))
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.dune = sample_book(title="Dune")
+        self.emma = sample_book(title="Emma")
+
+        # Monday 4th to Monday 11th of March 2024.
+        self.borrow(self.dune, at(4), returned=at(6))
+        self.borrow(self.dune, at(4, 15), returned=at(8, 15))
+        self.borrow(self.emma, at(5))
+        self.borrow(self.dune, at(11))
+        # Saved well before the refresh, which looks back a few minutes.
+        Borrowing.objects.update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        refresh_rollups()
+
+    def borrow(self, book, borrowed, returned=None):
+        borrowing = Borrowing.objects.create(
+            book=book,
+            expected_return_date=timezone.now() + timedelta(days=5),
+            user=self.user,
+        )
+        Borrowing.objects.filter(id=borrowing.id).update(
+            borrow_date=borrowed,
+            actual_return_date=returned,
+            updated_at=timezone.now(),
+        )
+        return borrowing
+
+    def get(self, url, **params):
+        self.client.force_authenticate(self.admin)
+        res = self.client.get(url, {"start": "2024-03-01",
+                                    "end": "2024-03-31", **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_rollups(self):
+        self.assertEqual(
+            list(DailyCirculation.objects.order_by("day").values_list(
+                "day", "borrows", "returns", "loan_duration"
+            )),
+            [
+                (date(2024, 3, 4), 2, 0, timedelta()),
+                (date(2024, 3, 5), 1, 0, timedelta()),
+                (date(2024, 3, 6), 0, 1, timedelta(days=2)),
+                (date(2024, 3, 8), 0, 1, timedelta(days=4)),
+                (date(2024, 3, 11), 1, 0, timedelta()),
+            ],
+        )
+        self.assertEqual(
+            DailyBookCirculation.objects.get(day=date(2024, 3, 4)).borrows, 2
+        )
+
+    def test_refresh_only_rebuilds_changed_days(self):
+        DailyCirculation.objects.filter(day=date(2024, 3, 11)).update(
+            borrows=100
+        )
+        self.borrow(self.emma, at(5, 18), returned=at(7))
+
+        days = refresh_rollups()
+
+        self.assertEqual(days, [date(2024, 3, 5), date(2024, 3, 7)])
+        self.assertEqual(
+            DailyCirculation.objects.get(day=date(2024, 3, 5)).borrows, 2
+        )
+        # Untouched days keep their rows, a full refresh rebuilds them.
+        self.assertEqual(
+            DailyCirculation.objects.get(day=date(2024, 3, 11)).borrows, 100
+        )
+        refresh_rollups(full=True)
+        self.assertEqual(
+            DailyCirculation.objects.get(day=date(2024, 3, 11)).borrows, 1
+        )
+
+    def test_refresh_picks_up_returns(self):
+        borrowing = Borrowing.objects.get(book=self.emma)
+
+        Borrowing.objects.filter(id=borrowing.id).return_books()
+        refresh_rollups()
+
+        today = DailyCirculation.objects.get(day=timezone.now().date())
+        self.assertEqual(today.returns, 1)
+
+    def test_borrows_per_day(self):
+        data = self.get(BORROWS_URL)
+
+        self.assertEqual(data[0], {"period": "2024-03-04", "borrows": 2,
+                                   "returns": 0, "average_loan_days": None})
+        self.assertEqual(data[2]["average_loan_days"], 2.0)
+
+    def test_borrows_per_week(self):
+        data = self.get(BORROWS_URL, period="week")
+
+        self.assertEqual(data, [
+            {"period": "2024-03-04", "borrows": 3, "returns": 2,
+             "average_loan_days": 3.0},
+            {"period": "2024-03-11", "borrows": 1, "returns": 0,
+             "average_loan_days": None},
+        ])
+
+    def test_top_books(self):
+        data = self.get(TOP_BOOKS_URL, limit=1)
+
+        self.assertEqual(data, [{"book_id": self.dune.id, "title": "Dune",
+                                 "author": "Sample author", "borrows": 3}])
+
+    def test_summary(self):
+        self.assertEqual(self.get(SUMMARY_URL, end="2024-03-10"), {
+            "borrows": 3, "returns": 2, "average_loan_days": 3.0
+        })
+
+    def test_served_from_rollups(self):
+        self.client.force_authenticate(self.admin)
+        throttle_queries = 1
+
+        with self.assertNumQueries(throttle_queries + 1):
+            self.client.get(BORROWS_URL)
+
+    def test_invalid_range(self):
+        self.client.force_authenticate(self.admin)
+
+        res = self.client.get(SUMMARY_URL, {"start": "2024-03-10",
+                                            "end": "2024-03-01"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_command(self):
+        out = io.StringIO()
+
+        call_command("refresh_analytics", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "Rollups are up to date.")
+
+        call_command("refresh_analytics", full=True, stdout=out)
+        self.assertIn("Rebuilt 5 days (2024-03-04 to 2024-03-11).",
+                      out.getvalue())
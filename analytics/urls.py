@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework import routers
+
+from analytics.views import AnalyticsViewSet
+
+router = routers.DefaultRouter()
+router.register("", AnalyticsViewSet, basename="analytics")
+
+urlpatterns = [path("", include(router.urls))]
+
+app_name = "analytics"
@@ -0,0 +1,98 @@
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek
+from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from analytics.models import DailyBookCirculation, DailyCirculation
+from analytics.serializers import (
+    BorrowsQuerySerializer,
+    CirculationSerializer,
+    DateRangeSerializer,
+    PeriodCirculationSerializer,
+    TopBookSerializer,
+    TopBooksQuerySerializer,
+)
+
+
+def average_loan_days(row):
+    if not row["returns"]:
+        return None
+
+    seconds = row["loan_duration"].total_seconds() / row["returns"]
+    return round(seconds / 86400, 2)
+
+
+def circulation(row):
+    row["average_loan_days"] = average_loan_days(row)
+    return row
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """Circulation statistics read from the daily rollups, which are kept
+    up to date by the refresh_analytics command."""
+    permission_classes = [IsAdminUser]
+
+    def get_params(self, serializer_class):
+        serializer = serializer_class(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def get_days(self, model, params):
+        return model.objects.filter(
+            day__range=(params["start"], params["end"])
+        )
+
+    @extend_schema(parameters=[BorrowsQuerySerializer],
+                   responses=PeriodCirculationSerializer(many=True))
+    @action(detail=False, methods=["get"], url_path="borrows")
+    def borrows(self, request):
+        params = self.get_params(BorrowsQuerySerializer)
+
+        period = (TruncWeek("day") if params["period"] == "week"
+                  else F("day"))
+        rows = (
+            self.get_days(DailyCirculation, params)
+            .values(period=period)
+            .annotate(borrows=Sum("borrows"), returns=Sum("returns"),
+                      loan_duration=Sum("loan_duration"))
+            .order_by("period")
+        )
+
+        return Response(PeriodCirculationSerializer(
+            [circulation(row) for row in rows], many=True
+        ).data)
+
+    @extend_schema(parameters=[TopBooksQuerySerializer],
+                   responses=TopBookSerializer(many=True))
+    @action(detail=False, methods=["get"], url_path="top-books")
+    def top_books(self, request):
+        params = self.get_params(TopBooksQuerySerializer)
+
+        rows = (
+            self.get_days(DailyBookCirculation, params)
+            .values("book_id", title=F("book__title"),
+                    author=F("book__author"))
+            .annotate(borrows=Sum("borrows"))
+            .order_by("-borrows", "book_id")[:params["limit"]]
+        )
+
+        return Response(TopBookSerializer(rows, many=True).data)
+
+    @extend_schema(parameters=[DateRangeSerializer],
+                   responses=CirculationSerializer)
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request):
+        params = self.get_params(DateRangeSerializer)
+
+        row = self.get_days(DailyCirculation, params).aggregate(
+            borrows=Sum("borrows"),
+            returns=Sum("returns"),
+            loan_duration=Sum("loan_duration"),
+        )
+        row["borrows"] = row["borrows"] or 0
+        row["returns"] = row["returns"] or 0
+
+        return Response(CirculationSerializer(circulation(row)).data)
@@ -0,0 +1,180 @@
+"""
+ASGI vs WSGI benchmark under slow clients.
+
+Starts the project under gunicorn (WSGI, sync workers) and uvicorn (ASGI)
+and drives both with a mix of fast clients and slow clients that trickle
+their request in and read the response in small pieces. Reports the
+throughput and latency seen by the fast clients for the book list.
+
+Both servers use the same database and settings as this process; the
+throttle rates are raised for the child processes so that requests are
+not rejected.
+
+    python -m benchmarks.asgi_vs_wsgi --connections 200 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+HOST = "127.0.0.1"
+PATH = "/api/books/"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def server_command(kind, port, workers, threads):
+    if kind == "wsgi":
+        return [
+            sys.executable, "-m", "gunicorn",
+            "library_service.wsgi:application",
+            "--bind", f"{HOST}:{port}",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn",
+        "library_service.asgi:application",
+        "--host", HOST,
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+        "--no-access-log",
+    ]
+
+
+def wait_until_listening(port, timeout=30):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+@contextmanager
+def running_server(kind, workers, threads):
+    port = free_port()
+    env = dict(
+        os.environ,
+        THROTTLE_ANON_RATE="100000000/day",
+        THROTTLE_USER_RATE="100000000/day",
+    )
+    env.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+    process = subprocess.Popen(server_command(kind, port, workers, threads),
+                               env=env)
+    try:
+        wait_until_listening(port)
+        yield port
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def fetch(port, path, slow, delay):
+    request = (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {HOST}\r\n"
+        "Accept: application/json\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+    reader, writer = await asyncio.open_connection(HOST, port)
+    started = time.perf_counter()
+
+    try:
+        if slow:
+            for start in range(0, len(request), 16):
+                writer.write(request[start:start + 16])
+                await writer.drain()
+                await asyncio.sleep(delay)
+        else:
+            writer.write(request)
+            await writer.drain()
+
+        status = (await reader.readline()).split(b" ", 2)[1]
+        while await reader.read(512 if slow else 65536):
+            if slow:
+                await asyncio.sleep(delay)
+    finally:
+        writer.close()
+
+    return status, time.perf_counter() - started
+
+
+async def client(port, path, slow, args, deadline, results):
+    while time.monotonic() < deadline:
+        try:
+            status, elapsed = await fetch(port, path, slow, args.delay)
+        except (OSError, IndexError):
+            status, elapsed = b"error", None
+        if not slow:
+            results.append((status, elapsed))
+
+
+async def drive(port, path, args):
+    results = []
+    deadline = time.monotonic() + args.duration
+    slow_clients = int(args.connections * args.slow_fraction)
+
+    await asyncio.gather(*(
+        client(port, path, i < slow_clients, args, deadline, results)
+        for i in range(args.connections)
+    ))
+    return results
+
+
+def report(name, results, duration):
+    latencies = sorted(
+        elapsed for status, elapsed in results if status == b"200"
+    )
+    failed = len(results) - len(latencies)
+
+    if not latencies:
+        print(f"{name:<26}no successful requests ({failed} failed)")
+        return
+
+    def percentile(value):
+        return latencies[min(len(latencies) - 1,
+                             int(len(latencies) * value))] * 1000
+
+    print(
+        f"{name:<26}{len(latencies) / duration:>9.1f} req/s   "
+        f"p50 {percentile(0.50):>8.1f}ms   "
+        f"p99 {percentile(0.99):>8.1f}ms   "
+        f"failed {failed}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--slow-fraction", type=float, default=0.5)
+    parser.add_argument("--delay", type=float, default=0.05,
+                        help="Pause between slow client reads and writes.")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4,
+                        help="Threads per gunicorn worker.")
+    args = parser.parse_args()
+
+    for kind in ("wsgi", "asgi"):
+        with running_server(kind, args.workers, args.threads) as port:
+            results = asyncio.run(drive(port, PATH, args))
+        report(kind, results, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Concurrent checkout benchmark.
+
+Runs N parallel checkouts of a single book through the real
+``borrowings:borrowing-list`` route and reports throughput together with a
+correctness check: the number of successful checkouts must never exceed
+the initial inventory, and the final inventory must match the number of
+created borrowings.
+
+Runs in a throwaway test database on the configured backend: a temporary
+SQLite file or a test_<name> database on Postgres, like the test runner.
+Postgres is recommended, SQLite serializes writers and will mostly measure
+lock waits.
+
+    python -m benchmarks.checkout_concurrency --workers 32 --inventory 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from books.models import Book  # noqa: E402
+from borrowings.models import Borrowing  # noqa: E402
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+USER_EMAIL = "checkout-bench-{}@bench.local"
+
+
+def checkout(user, book_id, barrier):
+    client = APIClient()
+    client.force_authenticate(user)
+    payload = {
+        "book": book_id,
+        "expected_return_date": timezone.now() + timedelta(days=5),
+    }
+
+    try:
+        barrier.wait()
+        started = time.perf_counter()
+        res = client.post(BORROWINGS_URL, payload)
+        return res.status_code, time.perf_counter() - started
+    finally:
+        connection.close()
+
+
+def run(workers, inventory):
+    user_model = get_user_model()
+    users = [
+        user_model.objects.create_user(USER_EMAIL.format(i), "benchpass")
+        for i in range(workers)
+    ]
+    book = Book.objects.create(
+        title="Checkout benchmark",
+        author="Benchmark",
+        cover="SOFT",
+        inventory=inventory,
+        daily_fee=1,
+    )
+
+    barrier = threading.Barrier(workers)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda user: checkout(user, book.id, barrier), users
+        ))
+    elapsed = time.perf_counter() - started
+
+    book.refresh_from_db()
+    created = Borrowing.objects.filter(book=book).count()
+    succeeded = sum(1 for status, _ in results if status == 201)
+    rejected = sum(1 for status, _ in results if status == 400)
+    errors = len(results) - succeeded - rejected
+    latencies = sorted(duration for _, duration in results)
+
+    print(f"workers:            {workers}")
+    print(f"initial inventory:  {inventory}")
+    print(f"succeeded:          {succeeded}")
+    print(f"rejected (400):     {rejected}")
+    print(f"errors:             {errors}")
+    print(f"final inventory:    {book.inventory}")
+    print(f"borrowings created: {created}")
+    print(f"elapsed:            {elapsed:.3f}s")
+    print(f"throughput:         {len(results) / elapsed:.1f} req/s")
+    print(f"max latency:        {latencies[-1] * 1000:.1f}ms")
+
+    correct = (
+        succeeded == created
+        and succeeded <= inventory
+        and book.inventory == inventory - created
+    )
+    print("correct:            " + ("yes" if correct else "NO"))
+    return correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--inventory", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    if connection.vendor == "sqlite":
+        # Threads need a shared file, not the default in-memory database.
+        test_settings = connection.settings_dict.setdefault("TEST", {})
+        test_settings["NAME"] = os.path.join(tempfile.mkdtemp(),
+                                             "checkout_concurrency.sqlite3")
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True
+    )
+
+    try:
+        correct = run(args.workers, args.inventory)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if not correct:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Database connection setup benchmark.
+
+Simulates requests that each run a few queries and then finish the way
+Django finishes a request (close_if_unusable_or_obsolete), and compares
+the per-request cost of:
+
+- a new connection per request (CONN_MAX_AGE = 0, Django's default),
+- a persistent connection per thread (CONN_MAX_AGE > 0),
+- the per-process pool of library_service.postgresql.
+
+Needs PostgreSQL; use --sslmode require to include the TLS handshake.
+
+    python -m benchmarks.db_connections --requests 500 --queries 3
+"""
+import argparse
+import copy
+import os
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from library_service.postgresql.base import DatabaseWrapper  # noqa: E402
+
+MODES = {
+    "new connection per request": {"CONN_MAX_AGE": 0, "POOL": {"SIZE": 0}},
+    "persistent (CONN_MAX_AGE)": {"CONN_MAX_AGE": 600, "POOL": {"SIZE": 0}},
+    "pooled": {"CONN_MAX_AGE": 0, "POOL": {"SIZE": 1}},
+}
+
+
+def run(overrides, requests, queries, sslmode):
+    settings_dict = copy.deepcopy(connection.settings_dict)
+    settings_dict.update(overrides)
+    if sslmode:
+        settings_dict["OPTIONS"]["sslmode"] = sslmode
+    wrapper = DatabaseWrapper(settings_dict, alias="bench")
+    durations = []
+
+    for _ in range(requests):
+        started = time.perf_counter()
+        with wrapper.cursor() as cursor:
+            for _ in range(queries):
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        wrapper.close_if_unusable_or_obsolete()
+        durations.append(time.perf_counter() - started)
+
+    wrapper.close()
+    DatabaseWrapper.close_pools()
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=3,
+                        help="Queries per request.")
+    parser.add_argument("--sslmode", help="e.g. require")
+    args = parser.parse_args()
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs a PostgreSQL database.")
+
+    print(f"{args.requests} requests of {args.queries} queries, "
+          f"sslmode {args.sslmode or 'default'}")
+    print(f"{'mode':<30}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    means = {}
+    for name, overrides in MODES.items():
+        durations = sorted(run(overrides, args.requests, args.queries,
+                               args.sslmode))
+        means[name] = statistics.mean(durations) * 1000
+        print(f"{name:<30}{means[name]:>9.3f}"
+              f"{durations[len(durations) // 2] * 1000:>9.3f}"
+              f"{durations[int(len(durations) * 0.95)] * 1000:>9.3f}")
+
+    baseline = means["new connection per request"]
+    print(f"\nThe pool saves {baseline - means['pooled']:.3f} ms per request "
+          f"({1 - means['pooled'] / baseline:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
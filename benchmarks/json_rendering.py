@@ -0,0 +1,129 @@
+"""
+JSON rendering and parsing benchmark.
+
+Renders representative book and borrowing list pages with DRF's
+JSONRenderer and with FastJSONRenderer, and parses a bulk return body
+with both parsers. Reports operations per second and checks that the
+rendered bytes are identical.
+
+    python -m benchmarks.json_rendering --rows 100 --repeat 200
+"""
+import argparse
+import io
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from library_service.parsers import FastJSONParser  # noqa: E402
+from library_service.renderers import FastJSONRenderer, orjson  # noqa: E402
+
+STARTED = datetime(2024, 3, 4, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def book_page(rows):
+    return {
+        "next": "http://testserver/api/books/?cursor=cD0yMA%3D%3D",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "title": f"Émile, ou De l’éducation, volume {i}",
+                "author": "Jean-Jacques Rousseau",
+                "cover": "SOFT",
+                "inventory": 5,
+                "daily_fee": "2.05",
+                "active_loans": 1,
+                "total_loans": i,
+                "last_borrowed_at": "2024-03-04T12:30:15.123456Z",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def raw_values(rows):
+    # Decimal and datetime objects left for the renderer to encode.
+    return [
+        {
+            "id": i,
+            "daily_fee": Decimal("2.05"),
+            "borrow_date": STARTED + timedelta(minutes=i),
+            "actual_return_date": None,
+        }
+        for i in range(rows)
+    ]
+
+
+def borrowing_page(rows):
+    return {
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "book": f"Book {i}",
+                "borrow_date": "2024-03-04T12:30:15.123456Z",
+                "expected_return_date": "2024-03-09T12:30:15Z",
+                "actual_return_date": None,
+                "user_id": i % 50,
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def rate(operation, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    return repeat / (time.perf_counter() - started)
+
+
+def report(name, regular, fast, same=True):
+    print(f"{name:<24}stdlib {regular:>9.0f}/s   fast {fast:>9.0f}/s   "
+          f"x{fast / regular:.1f}" + ("" if same else "   OUTPUT DIFFERS"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed, FastJSONRenderer uses the stdlib.")
+
+    payloads = {
+        "book list page": book_page(args.rows),
+        "borrowing list page": borrowing_page(args.rows),
+        "decimals and datetimes": raw_values(args.rows),
+    }
+    for name, payload in payloads.items():
+        report(
+            name,
+            rate(lambda: JSONRenderer().render(payload), args.repeat),
+            rate(lambda: FastJSONRenderer().render(payload), args.repeat),
+            JSONRenderer().render(payload)
+            == FastJSONRenderer().render(payload),
+        )
+
+    body = json.dumps({"ids": list(range(1, 1001))}).encode()
+    report(
+        "bulk return body",
+        rate(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat),
+        rate(lambda: FastJSONParser().parse(io.BytesIO(body)), args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
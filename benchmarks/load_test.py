@@ -0,0 +1,327 @@
+"""
+Endpoint load test.
+
+Seeds a throwaway test database, then drives the real routes with
+concurrent in-process clients (one thread and database connection each)
+and reports throughput, p50/p95/p99 latency and database queries per
+request for every scenario. Given a baseline saved by an earlier run, the
+command exits with status 1 when a scenario started running more queries
+or failing requests, or, if the baseline was recorded on the same kind of
+machine with the same options, got slower than the tolerance allows
+(throughput or median latency). Timings from another machine are only
+printed.
+
+Works against the configured database: SQLite (a temporary file) or a
+local Postgres (a test_<name> database, like the test runner).
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --requests 500 --concurrency 16
+    python -m benchmarks.load_test --save-baseline before.json
+    python -m benchmarks.load_test --baseline before.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+# Measure the throttles' cost without being rejected by them.
+os.environ.setdefault("THROTTLE_ANON_RATE", "1000000000/day")
+os.environ.setdefault("THROTTLE_USER_RATE", "1000000000/day")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from books.models import Book  # noqa: E402
+from borrowings.models import Borrowing  # noqa: E402
+
+MAX_EXTRA_QUERIES = 0.5
+PASSWORD = "benchpass"
+USER_EMAIL = "load-test-{}@bench.local"
+BOOKS_URL = reverse("books:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+TOKEN_URL = reverse("user:token_obtain_pair")
+BOOK_QUERIES = ("", "?page_size=50", "?search=tolkien",
+                "?ordering=-total_loans")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Dataset:
+    def __init__(self, books, users, borrowings):
+        self.books = books
+        self.users = users
+        self.borrowings = borrowings
+
+    def seed(self):
+        authors = ("J. R. R. Tolkien", "Frank Herbert", "Jane Austen")
+        Book.objects.bulk_create(
+            (
+                Book(title=f"Load test book {i}",
+                     author=authors[i % len(authors)],
+                     cover="SOFT", inventory=1_000_000,
+                     daily_fee="1.25", total_loans=i % 100)
+                for i in range(self.books)
+            ),
+            batch_size=1000,
+        )
+        password = make_password(PASSWORD)
+        get_user_model().objects.bulk_create(
+            get_user_model()(email=USER_EMAIL.format(i), password=password)
+            for i in range(self.users)
+        )
+
+        # Not every backend returns ids from bulk_create().
+        book_ids = list(Book.objects.order_by("id").values_list("id",
+                                                                flat=True))
+        users = list(get_user_model().objects.order_by("id"))
+        expected = timezone.now() + timedelta(days=14)
+        Borrowing.objects.bulk_create(
+            (
+                Borrowing(book_id=book_ids[i % len(book_ids)],
+                          user=users[i % len(users)],
+                          expected_return_date=expected)
+                for i in range(self.borrowings)
+            ),
+            batch_size=1000,
+        )
+
+        self.book_ids = book_ids
+        self.emails = [user.email for user in users]
+        self.tokens = [str(AccessToken.for_user(user)) for user in users]
+
+    def describe(self):
+        return {"books": self.books, "users": self.users,
+                "borrowings": self.borrowings}
+
+
+def list_books(client, i, dataset):
+    return client.get(BOOKS_URL + BOOK_QUERIES[i % len(BOOK_QUERIES)])
+
+
+def list_borrowings(client, i, dataset):
+    return client.get(
+        BORROWINGS_URL,
+        HTTP_AUTHORIZE=f"Bearer {dataset.tokens[i % len(dataset.tokens)]}",
+    )
+
+
+def checkout(client, i, dataset):
+    return client.post(
+        BORROWINGS_URL,
+        {
+            "book": dataset.book_ids[i % len(dataset.book_ids)],
+            "expected_return_date": timezone.now() + timedelta(days=7),
+        },
+        HTTP_AUTHORIZE=f"Bearer {dataset.tokens[i % len(dataset.tokens)]}",
+    )
+
+
+def obtain_token(client, i, dataset):
+    return client.post(TOKEN_URL, {
+        "email": dataset.emails[i % len(dataset.emails)],
+        "password": PASSWORD,
+    })
+
+
+SCENARIOS = {
+    "books:book-list": list_books,
+    "borrowings:borrowing-list": list_borrowings,
+    "checkout": checkout,
+    "token obtain": obtain_token,
+}
+
+
+def run_scenario(scenario, dataset, requests, concurrency):
+    local = threading.local()
+    counters = []
+
+    def request(i):
+        if not hasattr(local, "client"):
+            local.client = APIClient()
+            local.counter = QueryCounter()
+            counters.append(local.counter)
+            local.wrapper = connection.execute_wrapper(local.counter)
+            local.wrapper.__enter__()
+
+        started = time.perf_counter()
+        response = scenario(local.client, i, dataset)
+        return response.status_code, time.perf_counter() - started
+
+    def close(barrier):
+        # The barrier makes every worker thread run this exactly once.
+        barrier.wait()
+        if hasattr(local, "wrapper"):
+            local.wrapper.__exit__(None, None, None)
+        connection.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(request, range(requests)))
+        elapsed = time.perf_counter() - started
+
+        barrier = threading.Barrier(concurrency)
+        list(executor.map(close, [barrier] * concurrency))
+
+    latencies = sorted(duration for _, duration in results)
+
+    def percentile(value):
+        return latencies[min(len(latencies) - 1,
+                             int(len(latencies) * value))] * 1000
+
+    return {
+        "requests": requests,
+        "errors": sum(1 for status, _ in results if status >= 400),
+        "throughput": round(requests / elapsed, 1),
+        "p50": round(percentile(0.50), 2),
+        "p95": round(percentile(0.95), 2),
+        "p99": round(percentile(0.99), 2),
+        "queries": round(
+            sum(counter.count for counter in counters) / requests, 2
+        ),
+    }
+
+
+def report(results):
+    print(f"{'scenario':<28}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'queries':>9}{'errors':>8}")
+    for name, result in results.items():
+        print(f"{name:<28}{result['throughput']:>9.1f}{result['p50']:>9.1f}"
+              f"{result['p95']:>9.1f}{result['p99']:>9.1f}"
+              f"{result['queries']:>9.1f}{result['errors']:>8}")
+
+
+def compare(results, baseline, tolerance, timings=True):
+    """Print the change against ``baseline`` and return the regressions.
+
+    Throughput and latency only count when ``timings`` is true, i.e. the
+    baseline was recorded in the same environment.
+    """
+    regressions = []
+    print(f"\nCompared with the baseline (tolerance {tolerance:.0%}):")
+
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<28}no baseline")
+            continue
+
+        throughput = result["throughput"] / previous["throughput"] - 1
+        p50 = result["p50"] / previous["p50"] - 1
+        p95 = result["p95"] / previous["p95"] - 1
+        queries = result["queries"] - previous["queries"]
+        problems = []
+
+        # Tail latencies are too noisy on a laptop to fail a run on, they
+        # are only printed.
+        if timings and throughput < -tolerance:
+            problems.append("throughput")
+        if timings and p50 > tolerance:
+            problems.append("p50")
+        # Counts vary a little while per-thread caches warm up.
+        if queries >= MAX_EXTRA_QUERIES:
+            problems.append("queries")
+        if result["errors"] > previous["errors"]:
+            problems.append("errors")
+
+        print(f"{name:<28}req/s {throughput:>+7.1%}   p50 {p50:>+7.1%}   "
+              f"p95 {p95:>+7.1%}   queries {queries:>+5.1f}"
+              + (f"   REGRESSED: {', '.join(problems)}" if problems else ""))
+        regressions.extend(f"{name} {problem}" for problem in problems)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--borrowings", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenario", action="append",
+                        choices=SCENARIOS, help="Defaults to all.")
+    parser.add_argument("--baseline", type=Path,
+                        help="Compare with the results saved in this file.")
+    parser.add_argument("--save-baseline", type=Path, metavar="PATH",
+                        help="Save the results to compare later runs with.")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    if connection.vendor == "sqlite":
+        # Threads need a shared file, not the default in-memory database.
+        test_settings = connection.settings_dict.setdefault("TEST", {})
+        test_settings["NAME"] = os.path.join(tempfile.mkdtemp(),
+                                             "load_test.sqlite3")
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True
+    )
+    dataset = Dataset(args.books, args.users, args.borrowings)
+
+    try:
+        dataset.seed()
+        results = {
+            name: run_scenario(SCENARIOS[name], dataset, args.requests,
+                               args.concurrency)
+            for name in args.scenario or SCENARIOS
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report(results)
+    run_info = {
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "dataset": dataset.describe(),
+    }
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(
+            {"run": run_info, "results": results}, indent=2
+        ) + "\n")
+        print(f"\nSaved the baseline to {args.save_baseline}.")
+
+    if args.baseline is None:
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    # Absolute timings only compare within one environment.
+    timings = baseline["run"] == run_info
+    if not timings:
+        print(f"\nThe baseline was recorded with {baseline['run']}, "
+              "only queries and errors are checked.")
+
+    if compare(results, baseline["results"], args.tolerance, timings):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+List serialization benchmark.
+
+Serializes the same rows through the regular DRF serializers and through
+the ``values()`` fast path used by the list endpoints, and reports rows
+per second for both (query included). The rows are created inside a
+transaction that is rolled back at the end.
+
+    python -m benchmarks.serialization --rows 1000 --repeat 20
+"""
+import argparse
+import os
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from books.models import Book  # noqa: E402
+from books.serializers import BookSerializer  # noqa: E402
+from borrowings.models import Borrowing  # noqa: E402
+from borrowings.serializers import BorrowingListSerializer  # noqa: E402
+from library_service.fast_serialization import (  # noqa: E402
+    ValuesRepresentation,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(rows):
+    user = get_user_model().objects.create_user(
+        "serialization-bench@bench.local", "benchpass"
+    )
+    books = Book.objects.bulk_create(
+        Book(title=f"Benchmark book {i}", author="Benchmark", cover="SOFT",
+             inventory=5, daily_fee="1.25", total_loans=i,
+             last_borrowed_at=timezone.now())
+        for i in range(rows)
+    )
+    Borrowing.objects.bulk_create(
+        Borrowing(book=book, user=user,
+                  expected_return_date=timezone.now() + timedelta(days=5))
+        for book in books
+    )
+    return (
+        Book.objects.filter(author="Benchmark").order_by("id"),
+        Borrowing.objects.filter(user=user).select_related("book")
+        .order_by("-borrow_date", "-id"),
+    )
+
+
+def best_rate(serialize, rows, repeat):
+    best = min(timed(serialize) for _ in range(repeat))
+    return rows / best
+
+
+def timed(serialize):
+    started = time.perf_counter()
+    serialize()
+    return time.perf_counter() - started
+
+
+def compare(name, serializer_class, queryset, context, repeat):
+    rows = queryset.count()
+    representation = ValuesRepresentation(serializer_class(context=context))
+
+    regular = best_rate(
+        lambda: serializer_class(queryset, many=True, context=context).data,
+        rows, repeat,
+    )
+    fast = best_rate(
+        lambda: representation.to_representation(
+            representation.rows(queryset)
+        ),
+        rows, repeat,
+    )
+    print(f"{name:<26}serializer {regular:>10.0f} rows/s   "
+          f"values() {fast:>10.0f} rows/s   x{fast / regular:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Serializers only read request.user from the context.
+    staff = {"request": SimpleNamespace(user=SimpleNamespace(is_staff=True))}
+
+    try:
+        with transaction.atomic():
+            books, borrowings = seed(args.rows)
+            compare("BookSerializer", BookSerializer, books, {},
+                    args.repeat)
+            compare("BorrowingListSerializer", BorrowingListSerializer,
+                    borrowings, staff, args.repeat)
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Throttle latency benchmark.
+
+Compares the per-request cost of DRF's cache-backed UserRateThrottle (local
+memory unless CACHES says otherwise, so not shared between workers) with
+the database-backed UserTokenBucketThrottle.
+
+    python -m benchmarks.throttle_latency --requests 5000 --users 100
+"""
+import argparse
+import os
+import statistics
+import time
+from types import SimpleNamespace
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework.throttling import UserRateThrottle  # noqa: E402
+
+from throttling.models import ThrottleBucket  # noqa: E402
+from throttling.throttles import UserTokenBucketThrottle  # noqa: E402
+
+RATE = "1000000/day"
+SCOPE = "throttle-bench"
+
+
+class InMemoryThrottle(UserRateThrottle):
+    scope = SCOPE
+    rate = RATE
+
+
+class TokenBucketThrottle(UserTokenBucketThrottle):
+    scope = SCOPE
+    rate = RATE
+
+
+def make_requests(users):
+    factory = APIRequestFactory()
+    requests = []
+
+    for pk in range(users):
+        request = Request(factory.get("/"))
+        request.user = SimpleNamespace(pk=pk, is_authenticated=True)
+        requests.append(request)
+
+    return requests
+
+
+def measure(throttle_class, requests, total):
+    latencies = []
+
+    for i in range(total):
+        request = requests[i % len(requests)]
+        started = time.perf_counter()
+        throttle_class().allow_request(request, None)
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    return {
+        "mean": statistics.fmean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+    }
+
+
+def report(name, result):
+    print(
+        f"{name:<22}"
+        + "".join(
+            f"{label} {value * 1_000_000:>9.1f}us   "
+            for label, value in result.items()
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    requests = make_requests(args.users)
+
+    try:
+        report("in-memory (DRF)", measure(InMemoryThrottle, requests,
+                                          args.requests))
+        report("token bucket (db)", measure(TokenBucketThrottle, requests,
+                                            args.requests))
+    finally:
+        ThrottleBucket.objects.filter(
+            key__startswith=f"throttle_{SCOPE}_"
+        ).delete()
+        cache.delete_many(
+            [f"throttle_{SCOPE}_{pk}" for pk in range(args.users)]
+        )
+
+
+if __name__ == "__main__":
+    main()
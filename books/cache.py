@@ -0,0 +1,121 @@
+import hashlib
+import time
+from functools import partial
+
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from books.models import Book
+from library_service.replicas import cache_source, cache_timeout
+
+CATALOG_CACHE = "catalog"
+CATALOG_VERSION_KEY = "books:catalog-version"
+
+
+def get_catalog_cache():
+    return caches[CATALOG_CACHE]
+
+
+def set_catalog_version():
+    version = time.time_ns()
+    get_catalog_cache().set(CATALOG_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def get_catalog_version():
+    version = get_catalog_cache().get(CATALOG_VERSION_KEY)
+
+    if version is None:
+        version = set_catalog_version()
+
+    return version
+
+
+def get_book_updated_at(pk):
+    """Return the change marker of a book, or None if it does not exist.
+
+    Markers are cached under the catalog version, which every book change
+    bumps, so a warm lookup costs no queries, and apart for replica reads,
+    see ``cache_source``.
+    """
+    cache = get_catalog_cache()
+    key = f"books:updated-at:{get_catalog_version()}:{cache_source()}:{pk}"
+    updated_at = cache.get(key)
+
+    if updated_at is None:
+        try:
+            updated_at = (
+                Book.objects.filter(pk=pk)
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+
+        if updated_at is not None:
+            cache.set(key, updated_at, cache_timeout())
+
+    return updated_at
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response.
+
+    The version is bumped again once the surrounding transaction commits,
+    so a response cached from the pre-commit state is never served later.
+    """
+    set_catalog_version()
+    transaction.on_commit(set_catalog_version)
+
+
+class CatalogCacheMixin:
+    """Serve safe read actions from a cache keyed on the catalog version."""
+
+    def get_catalog_cache_key(self, request):
+        # Media type parameters (e.g. indent) shape the body, and the
+        # host and scheme end up in the pagination links.
+        variant = hashlib.md5(
+            f"{request.accepted_media_type}|{request.build_absolute_uri()}"
+            .encode()
+        ).hexdigest()
+        return (
+            f"books:response:{get_catalog_version()}:{cache_source()}:"
+            f"{variant}"
+        )
+
+    def cached_response(self, request, render):
+        if request.accepted_renderer.format != "json":
+            return render()
+
+        cache = get_catalog_cache()
+        key = self.get_catalog_cache_key(request)
+        cached = cache.get(key)
+
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = render()
+
+        if response.status_code == 200:
+            # Rendering happens after the view, outside its replica.
+            timeout = cache_timeout()
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key, (rendered.content, rendered["Content-Type"]),
+                    timeout,
+                )
+            )
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
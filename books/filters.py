@@ -0,0 +1,97 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from books.search import BookSearchFilter
+
+ORDERING_FIELDS = ("active_loans", "total_loans", "last_borrowed_at")
+# Largest value of the counters' integer columns.
+MAX_LOANS = 2 ** 31 - 1
+
+
+class BookStatsFilter(BaseFilterBackend):
+    """Filter and sort books by their circulation counters.
+
+    Cursor pagination takes its ordering from the first filter backend, so
+    this backend has to come before ``BookSearchFilter`` and falls back to
+    its ordering (relevance, then id) when no sort is requested.
+    """
+    ordering_param = "ordering"
+
+    def get_requested_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_param, "")
+
+        if ordering.lstrip("-") not in ORDERING_FIELDS:
+            return None
+
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        on_loan = request.query_params.get("on_loan")
+
+        if on_loan is not None:
+            queryset = queryset.filter(active_loans__gt=0) if (
+                on_loan.lower() in ["true", "yes"]) else (
+                queryset.filter(active_loans=0))
+
+        min_total_loans = request.query_params.get("min_total_loans")
+
+        if min_total_loans is not None:
+            try:
+                # Not str.isdigit(), which also accepts e.g. "²".
+                min_total_loans = int(min_total_loans)
+            except ValueError:
+                min_total_loans = -1
+            if min_total_loans < 0:
+                raise ValidationError(
+                    {"min_total_loans": "Must be a non-negative integer."}
+                )
+            queryset = queryset.filter(
+                total_loans__gte=min(min_total_loans, MAX_LOANS)
+            )
+
+        return queryset
+
+    def get_ordering(self, request, queryset, view):
+        ordering = self.get_requested_ordering(request)
+
+        if ordering is None:
+            return BookSearchFilter().get_ordering(request, queryset, view)
+
+        return ordering, "-id" if ordering.startswith("-") else "id"
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": "on_loan",
+                "required": False,
+                "in": "query",
+                "description": "Filter by whether any copy is currently "
+                               "borrowed (ex. ?on_loan=true)",
+                "schema": {"type": "boolean"},
+            },
+            {
+                "name": "min_total_loans",
+                "required": False,
+                "in": "query",
+                "description": "Only books borrowed at least this many "
+                               "times (ex. ?min_total_loans=10)",
+                "schema": {"type": "integer", "minimum": 0},
+            },
+            {
+                "name": self.ordering_param,
+                "required": False,
+                "in": "query",
+                "description": "Sort by a circulation counter, prefix with "
+                               "- for descending (ex. ?ordering=-total_loans)."
+                               " Books that were never borrowed come last "
+                               "when sorting by last_borrowed_at.",
+                "schema": {
+                    "type": "string",
+                    "enum": [
+                        prefix + field
+                        for field in ORDERING_FIELDS
+                        for prefix in ("", "-")
+                    ],
+                },
+            },
+        ]
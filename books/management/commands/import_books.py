@@ -0,0 +1,63 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books.importer import (
+    ENCODING,
+    FORMATS,
+    BookImporter,
+    detect_format,
+    iter_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Stream books from a CSV or JSON Lines file into the catalog."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, - for stdin.")
+        parser.add_argument("--format", choices=FORMATS,
+                            help="Defaults to the file extension.")
+        parser.add_argument("--upsert", action="store_true",
+                            help="Update books with the same title and "
+                                 "author instead of adding duplicates.")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or detect_format(path)
+
+        if file_format is None:
+            raise CommandError("Cannot detect the format, use --format.")
+
+        importer = BookImporter(
+            upsert=options["upsert"],
+            chunk_size=options["chunk_size"],
+            progress=self.report_progress,
+        )
+
+        try:
+            if path == "-":
+                result = importer.run(iter_rows(sys.stdin, file_format))
+            else:
+                with open(path, newline="", encoding=ENCODING) as stream:
+                    result = importer.run(iter_rows(stream, file_format))
+        except (OSError, UnicodeDecodeError) as error:
+            raise CommandError(f"Import stopped after {importer.rows} "
+                               f"rows: {error}")
+
+        for error in result["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['rows']} rows: {result['created']} created, "
+            f"{result['updated']} updated, {result['invalid']} invalid "
+            f"({result['rows_per_second']} rows/s)."
+        ))
+
+    def report_progress(self, importer):
+        self.stdout.write(
+            f"{importer.rows} rows, {importer.rows_per_second:.0f} rows/s"
+        )
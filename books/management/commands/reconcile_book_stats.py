@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from books.cache import bump_catalog_version
+from books.models import Book
+from books.stats import actual_loan_stats, drifted_books
+from borrowings.models import Borrowing
+
+COUNTERS = ("active_loans", "total_loans", "last_borrowed_at")
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Rebuild the book circulation counters from borrowings and report "
+        "books whose counters had drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only report drift.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = drifted_books(Book.objects.all(), Borrowing)
+
+            if options["verbosity"] > 1:
+                for book in drifted.order_by("id").iterator():
+                    changes = ", ".join(
+                        f"{counter} {getattr(book, counter)} -> "
+                        f"{getattr(book, f'actual_{counter}')}"
+                        for counter in COUNTERS
+                    )
+                    self.stdout.write(f"Book {book.id}: {changes}")
+
+            if options["dry_run"]:
+                fixed = drifted.count()
+            else:
+                # One UPDATE recomputing every drifted book from borrowings.
+                fixed = Book.objects.filter(
+                    pk__in=drifted.values("pk")
+                ).update(
+                    **actual_loan_stats(Borrowing),
+                    updated_at=timezone.now(),
+                )
+                if fixed:
+                    bump_catalog_version()
+
+        verb = "have" if options["dry_run"] else "had"
+        self.stdout.write(f"{fixed} books {verb} drifted stats.")
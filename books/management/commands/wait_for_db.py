@@ -1,17 +1,61 @@
-import time
-from django.db import connections
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+from library_service.health import unapplied_migrations, wait_for_database
 
 
 class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Wait until the database accepts connections, retrying with "
+        "exponential backoff, then check for unapplied migrations."
+    )
+    # Startup should not pay for the system checks, the server runs them.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=float, default=60,
+                            help="Seconds to wait for the database.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--migrate", action="store_true",
+                            help="Apply unapplied migrations, if any.")
+        parser.add_argument("--check-migrations", action="store_true",
+                            help="Fail if migrations are unapplied.")
+
     def handle(self, *args, **options):
+        alias = options["database"]
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
-            try:
-                db_conn = connections["default"]
-                self.stdout.write(self.style.SUCCESS("Database available!"))
-            except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
+
+        def on_retry(exc, delay):
+            self.stdout.write(
+                f"Database unavailable, retrying in {delay:.1f}s: "
+                f"{str(exc).strip()}"
+            )
+
+        try:
+            attempts = wait_for_database(alias, timeout=options["timeout"],
+                                         on_retry=on_retry)
+        except DatabaseError as exc:
+            raise CommandError(
+                f"Database unavailable after {options['timeout']:g}s: {exc}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Database available after {attempts} attempt(s)."
+        ))
+
+        if not (options["migrate"] or options["check_migrations"]):
+            return
+
+        pending = unapplied_migrations(alias)
+        if not pending:
+            self.stdout.write("No unapplied migrations.")
+        elif options["migrate"]:
+            # Only now pay for loading the migration executor.
+            call_command("migrate", database=alias, interactive=False,
+                         verbosity=options["verbosity"])
+        else:
+            raise CommandError(
+                "Unapplied migrations: "
+                + ", ".join(f"{app}.{name}" for app, name in pending)
+            )
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        """
+        ALTER TABLE books_book ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A') ||
+            setweight(to_tsvector('english', author), 'B')
+        ) STORED
+        """
+    )
+    schema_editor.execute(
+        "CREATE INDEX book_search_vector_idx "
+        "ON books_book USING gin (search_vector)"
+    )
+
+
+def remove_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "ALTER TABLE books_book DROP COLUMN search_vector"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
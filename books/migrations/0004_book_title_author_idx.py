@@ -0,0 +1,17 @@
+# Generated by Django 4.0.4 on 2026-10-18 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_book_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title', 'author'], name='book_title_author_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.0.4 on 2026-10-18 10:01
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_loan_stats(apps, schema_editor):
+    # Frozen copy of books.stats.actual_loan_stats as of this migration.
+    Book = apps.get_model("books", "Book")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+
+    borrowings = (
+        Borrowing.objects.filter(book=OuterRef("pk"))
+        .order_by()
+        .values("book")
+    )
+
+    Book.objects.update(
+        active_loans=Coalesce(Subquery(
+            borrowings.filter(actual_return_date__isnull=True)
+            .annotate(count=Count("id")).values("count")
+        ), 0),
+        total_loans=Coalesce(Subquery(
+            borrowings.annotate(count=Count("id")).values("count")
+        ), 0),
+        last_borrowed_at=Subquery(
+            borrowings.annotate(latest=Max("borrow_date")).values("latest")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_book_title_author_idx'),
+        ('borrowings', '0005_borrowing_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='active_loans',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='last_borrowed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='total_loans',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_loan_stats, migrations.RunPython.noop),
+    ]
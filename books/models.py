@@ -14,6 +14,24 @@ class Book(models.Model):
                              choices=[(tag.value, tag.name) for tag in Cover])
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=6, decimal_places=2)
+    # Change marker for conditional requests, set explicitly by bulk updates.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Circulation counters, kept up to date by checkouts and returns
+    # (see reconcile_book_stats to rebuild them from borrowings).
+    active_loans = models.PositiveIntegerField(default=0)
+    total_loans = models.PositiveIntegerField(default=0)
+    last_borrowed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Matches imported rows to existing books in upsert mode.
+            models.Index(fields=["title", "author"],
+                         name="book_title_author_idx"),
+            # The circulation counters are left unindexed: every checkout
+            # and return changes them, and without an index on them those
+            # updates stay HOT on Postgres. Sorting by one scans the
+            # catalog for each page instead.
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -0,0 +1,8 @@
+from library_service.pagination import KeysetCursorPagination
+
+
+class BookPagination(KeysetCursorPagination):
+    ordering = "id"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
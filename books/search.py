@@ -0,0 +1,90 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+
+from books.models import Book
+
+SEARCH_CONFIG = "english"
+
+
+def search_vector():
+    # Generated column maintained by Postgres on every write (see
+    # migration 0002_book_search_vector). It is deliberately not a model
+    # field, so regular book queries never load it.
+    return RawSQL(f'"{Book._meta.db_table}"."search_vector"', [],
+                  output_field=SearchVectorField())
+
+
+def postgres_search(queryset, query):
+    search_query = SearchQuery(query, config=SEARCH_CONFIG,
+                               search_type="websearch")
+
+    return (
+        queryset.alias(search_vector=search_vector())
+        .filter(search_vector=search_query)
+        # ts_rank is a float4, whose value the cursor position (a Python
+        # float as text) does not match; compare as double precision.
+        .annotate(rank=Cast(SearchRank(F("search_vector"), search_query),
+                            FloatField()))
+    )
+
+
+def icontains_search(queryset, query):
+    condition = Q()
+
+    for term in query.split():
+        condition &= Q(title__icontains=term) | Q(author__icontains=term)
+
+    return queryset.filter(condition)
+
+
+def search_books(queryset, query):
+    """Filter books by title and author.
+
+    On Postgres the result is annotated with a ``rank`` relevance score,
+    other databases fall back to case-insensitive substring matching.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        return postgres_search(queryset, query)
+
+    return icontains_search(queryset, query)
+
+
+class BookSearchFilter(BaseFilterBackend):
+    search_param = "search"
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+
+        if not query:
+            return queryset
+
+        return search_books(queryset, query)
+
+    def get_ordering(self, request, queryset, view):
+        if "rank" in queryset.query.annotations:
+            return "-rank", "id"
+
+        return view.paginator.ordering
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Search books by title and author, most "
+                               "relevant first (ex. ?search=tolkien)",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from books.importer import FORMATS, detect_format
 from books.models import Book
 
 
@@ -13,4 +14,26 @@ class BookSerializer(serializers.ModelSerializer):
             "cover",
             "inventory",
             "daily_fee",
+            "active_loans",
+            "total_loans",
+            "last_borrowed_at",
         )
+        read_only_fields = ("active_loans", "total_loans", "last_borrowed_at")
+
+
+class BookImportSerializer(serializers.Serializer):
+    file = serializers.FileField()  # noqa: VNE002
+    format = serializers.ChoiceField(  # noqa: VNE003
+        choices=FORMATS, required=False
+    )
+    upsert = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("format", detect_format(attrs["file"].name))
+
+        if attrs["format"] is None:
+            raise serializers.ValidationError(
+                {"format": "Cannot detect the format from the file name."}
+            )
+
+        return attrs
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Stands in for "never borrowed" so missing dates compare as equal.
+NEVER = Value(datetime(1970, 1, 1, tzinfo=timezone.utc))
+
+
+def actual_loan_stats(borrowing_model):
+    """Expressions recomputing a book's circulation counters from its
+    borrowings, usable in ``annotate()`` and ``update()``.
+
+    Takes the borrowing model as an argument, e.g. a historical one.
+    Migration 0005_book_loan_stats keeps its own copy.
+    """
+    borrowings = (
+        borrowing_model.objects.filter(book=OuterRef("pk"))
+        .order_by()
+        .values("book")
+    )
+
+    return {
+        "active_loans": Coalesce(Subquery(
+            borrowings.filter(actual_return_date__isnull=True)
+            .annotate(count=Count("id")).values("count")
+        ), 0),
+        "total_loans": Coalesce(Subquery(
+            borrowings.annotate(count=Count("id")).values("count")
+        ), 0),
+        "last_borrowed_at": Subquery(
+            borrowings.annotate(latest=Max("borrow_date")).values("latest")
+        ),
+    }
+
+
+def drifted_books(queryset, borrowing_model):
+    """Books whose stored counters differ from their borrowings, annotated
+    with the actual values as ``actual_<counter>``."""
+    stats = actual_loan_stats(borrowing_model)
+
+    return queryset.annotate(
+        **{f"actual_{name}": value for name, value in stats.items()}
+    ).alias(
+        stored_last_borrowed_at=Coalesce("last_borrowed_at", NEVER),
+        checked_last_borrowed_at=Coalesce("actual_last_borrowed_at", NEVER),
+    ).filter(
+        ~Q(active_loans=F("actual_active_loans"))
+        | ~Q(total_loans=F("actual_total_loans"))
+        | ~Q(stored_last_borrowed_at=F("checked_last_borrowed_at"))
+    )
@@ -0,0 +1,15 @@
+from books.models import Book
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Sample book",
+        "author": "Sample author",
+        "cover": "SOFT",
+        "inventory": 5,
+        "daily_fee": 2.05
+    }
+
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
@@ -0,0 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from books.tests.factories import sample_book
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class AsgiBooksApiTests(TestCase):
+    """The book endpoints served through Django's ASGI handler."""
+
+    def setUp(self):
+        self.book = sample_book()
+        sample_book(title="Dune")
+
+    async def test_list_matches_wsgi(self):
+        async_res = await self.async_client.get(BOOKS_URL,
+                                                {"search": "dune"})
+        sync_res = await sync_to_async(self.client.get)(BOOKS_URL,
+                                                        {"search": "dune"})
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json()["results"],
+                         sync_res.json()["results"])
+
+    async def test_detail_revalidates(self):
+        url = reverse("books:book-detail", args=[self.book.id])
+
+        res = await self.async_client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = await self.async_client.get(url, if_none_match=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_missing_book(self):
+        res = await self.async_client.get(
+            reverse("books:book-detail", args=[self.book.id + 100])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
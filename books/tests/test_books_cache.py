@@ -0,0 +1,164 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from datetime import timedelta
+
+from books.cache import get_catalog_cache
+from books.tests.factories import sample_book
+from borrowings.models import Borrowing
+
+# Anonymous requests take a token from the anon and the user rate buckets.
+THROTTLE_QUERIES = 2
+
+BOOKS_URL = reverse("books:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+def detail_url(book_id):
+    return reverse("books:book-detail", args=[book_id])
+
+
+class BookCatalogCacheTests(TestCase):
+    def setUp(self):
+        get_catalog_cache().clear()
+        self.client = APIClient()
+        self.book = sample_book()
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(BOOKS_URL)
+
+        with self.assertNumQueries(THROTTLE_QUERIES):
+            second = self.client.get(BOOKS_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+
+    def test_detail_is_served_from_cache(self):
+        self.client.get(detail_url(self.book.id))
+
+        with self.assertNumQueries(THROTTLE_QUERIES):
+            res = self.client.get(detail_url(self.book.id))
+
+        self.assertEqual(res.json()["id"], self.book.id)
+
+    def test_query_string_is_part_of_the_key(self):
+        sample_book(title="Dune")
+        self.client.get(BOOKS_URL)
+
+        res = self.client.get(BOOKS_URL, {"search": "dune"})
+
+        self.assertEqual(len(res.json()["results"]), 1)
+
+    def test_media_type_is_part_of_the_key(self):
+        indented = self.client.get(BOOKS_URL,
+                                   HTTP_ACCEPT="application/json; indent=4")
+        plain = self.client.get(BOOKS_URL, HTTP_ACCEPT="application/json")
+
+        self.assertIn(b"\n", indented.content)
+        self.assertNotIn(b"\n", plain.content)
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "other.example.com"])
+    def test_host_is_part_of_the_key(self):
+        sample_book(title="Second book")
+        params = {"page_size": 1}
+
+        other = self.client.get(BOOKS_URL, params,
+                                HTTP_HOST="other.example.com")
+        res = self.client.get(BOOKS_URL, params)
+
+        self.assertTrue(
+            other.json()["next"].startswith("http://other.example.com/")
+        )
+        self.assertTrue(res.json()["next"].startswith("http://testserver/"))
+
+    def test_missing_book_is_not_cached(self):
+        self.client.get(detail_url(self.book.id + 1))
+
+        # Change marker lookup and the 404 lookup itself.
+        with self.assertNumQueries(THROTTLE_QUERIES + 2):
+            self.client.get(detail_url(self.book.id + 1))
+
+    def test_write_through_api_invalidates_cache(self):
+        self.client.get(BOOKS_URL)
+        self.client.force_authenticate(self.admin)
+
+        self.client.patch(detail_url(self.book.id), {"title": "New title"})
+        res = self.client.get(BOOKS_URL)
+
+        self.assertEqual(res.json()["results"][0]["title"], "New title")
+
+    def test_checkout_and_return_invalidate_cache(self):
+        self.client.get(detail_url(self.book.id))
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(BORROWINGS_URL, {
+            "book": self.book.id,
+            "expected_return_date": timezone.now() + timedelta(days=5),
+        })
+        inventory = self.client.get(detail_url(self.book.id)).json()[
+            "inventory"
+        ]
+        self.assertEqual(inventory, 4)
+
+        Borrowing.objects.filter(id=res.data["id"]).return_books()
+        inventory = self.client.get(detail_url(self.book.id)).json()[
+            "inventory"
+        ]
+        self.assertEqual(inventory, 5)
+
+
+class BookConditionalGetTests(TestCase):
+    def setUp(self):
+        get_catalog_cache().clear()
+        self.client = APIClient()
+        self.book = sample_book()
+
+    def test_detail_has_validators(self):
+        res = self.client.get(detail_url(self.book.id))
+
+        self.assertIn("ETag", res)
+        self.assertIn("Last-Modified", res)
+
+    def test_detail_not_modified(self):
+        etag = self.client.get(detail_url(self.book.id))["ETag"]
+
+        with self.assertNumQueries(THROTTLE_QUERIES):
+            res = self.client.get(detail_url(self.book.id),
+                                  HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+    def test_detail_modified_after_change(self):
+        etag = self.client.get(detail_url(self.book.id))["ETag"]
+
+        self.book.title = "New title"
+        self.book.save()
+
+        res = self.client.get(detail_url(self.book.id),
+                              HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(res.json()["title"], "New title")
+
+    def test_other_book_change_keeps_etag(self):
+        etag = self.client.get(detail_url(self.book.id))["ETag"]
+
+        sample_book(title="Another book")
+
+        res = self.client.get(detail_url(self.book.id),
+                              HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
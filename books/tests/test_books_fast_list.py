@@ -0,0 +1,82 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import serializers
+
+from books.cache import get_catalog_cache
+from books.models import Book
+from books.tests.factories import sample_book
+from books.serializers import BookSerializer
+from books.views import BookViewSet
+from library_service.fast_serialization import ValuesRepresentation
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class BookFastListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        sample_book(title="Dune", daily_fee=Decimal("2"), cover="HARD")
+        sample_book(title="Émile, ou De l’éducation", author="Rousseau",
+                    daily_fee=Decimal("0.50"), total_loans=3,
+                    last_borrowed_at=timezone.now())
+        for i in range(5):
+            sample_book(title=f"Book {i}", active_loans=i)
+
+    def get_both(self, params):
+        fast = self.client.get(BOOKS_URL, params)
+        get_catalog_cache().clear()
+
+        with mock.patch.object(BookViewSet, "fast_list", False):
+            slow = self.client.get(BOOKS_URL, params)
+        get_catalog_cache().clear()
+
+        return fast, slow
+
+    def test_same_json_as_serializer(self):
+        for params in ({}, {"page_size": 3}, {"search": "dune"},
+                       {"ordering": "-active_loans", "page_size": 2},
+                       {"ordering": "last_borrowed_at"}):
+            fast, slow = self.get_both(params)
+
+            self.assertEqual(fast.content, slow.content, params)
+
+    def test_same_json_on_next_page(self):
+        fast, slow = self.get_both({"page_size": 3,
+                                    "ordering": "-active_loans"})
+
+        self.assertEqual(self.client.get(fast.data["next"]).content,
+                         self.client.get(slow.data["next"]).content)
+
+    def test_values_rows_match_serializer(self):
+        queryset = Book.objects.order_by("id")
+
+        for current_timezone in ("UTC", "Europe/Kyiv"):
+            with timezone.override(current_timezone):
+                representation = ValuesRepresentation(BookSerializer())
+
+                self.assertEqual(
+                    representation.to_representation(
+                        representation.rows(queryset)
+                    ),
+                    BookSerializer(queryset, many=True).data,
+                )
+
+    def test_unsupported_serializer(self):
+        class BookWithMethodSerializer(BookSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta(BookSerializer.Meta):
+                fields = BookSerializer.Meta.fields + ("label",)
+
+            def get_label(self, book):
+                return str(book)
+
+        self.assertFalse(
+            ValuesRepresentation(BookWithMethodSerializer()).supported
+        )
@@ -0,0 +1,239 @@
+import io
+import json
+import tempfile
+from decimal import Decimal
+from functools import partial
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from books.importer import BookImporter, ImportRowError, clean_row, iter_rows
+from books.models import Book
+
+IMPORT_URL = reverse("books:book-import-books")
+
+CSV_CATALOG = (
+    "title,author,cover,inventory,daily_fee\n"
+    "The Hobbit,J. R. R. Tolkien,HARD,3,1.50\n"
+    "Dune,Frank Herbert,soft,2,0.99\n"
+    ",Nobody,SOFT,1,1\n"
+    "Emma,Jane Austen,SOFT,-1,1\n"
+)
+
+valid_row = {
+    "title": "Dune",
+    "author": "Frank Herbert",
+    "cover": "SOFT",
+    "inventory": "2",
+    "daily_fee": "0.99",
+}
+
+
+def jsonl(*rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+class CleanRowTests(TestCase):
+    def test_valid_row(self):
+        self.assertEqual(
+            clean_row(valid_row),
+            ("Dune", "Frank Herbert", "SOFT", 2, Decimal("0.99")),
+        )
+
+    def test_invalid_rows(self):
+        invalid_values = {
+            "title": ["", "  ", None, "x" * 256],
+            "cover": ["PAPER", ""],
+            "inventory": ["-1", "1.5", "many", True, None],
+            "daily_fee": ["-1", "1.001", "10000", "NaN", "fee", None],
+        }
+
+        for field, values in invalid_values.items():
+            for value in values:
+                with self.subTest(field=field, value=value):
+                    with self.assertRaises(ImportRowError):
+                        clean_row({**valid_row, field: value})
+
+    def test_not_an_object(self):
+        with self.assertRaises(ImportRowError):
+            clean_row(["Dune"])
+
+
+class BookImporterTests(TestCase):
+    def run_import(self, text, file_format="csv", **kwargs):
+        importer = BookImporter(**kwargs)
+        return importer.run(iter_rows(io.StringIO(text), file_format))
+
+    def test_import_csv(self):
+        result = self.run_import(CSV_CATALOG)
+
+        self.assertEqual(result["rows"], 4)
+        self.assertEqual(result["created"], 2)
+        self.assertEqual(result["invalid"], 2)
+        self.assertEqual([error["line"] for error in result["errors"]],
+                         [4, 5])
+        self.assertEqual(Book.objects.get(title="Dune").cover, "SOFT")
+
+    def test_import_jsonl(self):
+        result = self.run_import(
+            jsonl(valid_row, {**valid_row, "title": "Children of Dune"})
+            + "not json\n",
+            file_format="jsonl",
+        )
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual(result["errors"][0]["line"], 3)
+
+    def test_import_in_chunks(self):
+        chunks = []
+        rows = [{**valid_row, "title": f"Book {i}"} for i in range(5)]
+
+        result = self.run_import(
+            jsonl(*rows), file_format="jsonl", chunk_size=2,
+            progress=lambda importer: chunks.append(importer.rows),
+        )
+
+        self.assertEqual(result["created"], 5)
+        self.assertEqual(chunks, [2, 4, 5])
+
+    def test_upsert_updates_existing_books(self):
+        book = Book.objects.create(title="Dune", author="Frank Herbert",
+                                   cover="HARD", inventory=1, daily_fee=5)
+
+        result = self.run_import(
+            jsonl(
+                valid_row,
+                {**valid_row, "author": "Someone else"},
+                {**valid_row, "inventory": "7"},
+            ),
+            file_format="jsonl",
+            upsert=True,
+        )
+
+        book.refresh_from_db()
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(book.inventory, 7)
+        self.assertEqual(book.cover, "SOFT")
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_upsert_in_chunks_inside_a_transaction(self):
+        # TestCase wraps every test in a transaction, as an outer atomic
+        # block would: the chunks share one.
+        rows = [{**valid_row, "title": f"Book {i}"} for i in range(3)]
+
+        result = self.run_import(
+            jsonl(*rows, {**valid_row, "title": "Book 0", "inventory": "9"}),
+            file_format="jsonl", chunk_size=2, upsert=True,
+        )
+
+        self.assertEqual(result["created"], 3)
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(Book.objects.get(title="Book 0").inventory, 9)
+
+    def test_insert_mode_keeps_duplicates(self):
+        self.run_import(jsonl(valid_row), file_format="jsonl")
+        self.run_import(jsonl(valid_row), file_format="jsonl")
+
+        self.assertEqual(Book.objects.filter(title="Dune").count(), 2)
+
+
+class ImportBooksCommandTests(TestCase):
+    def test_import_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as catalog:
+            catalog.write(CSV_CATALOG)
+            catalog.flush()
+
+            out = io.StringIO()
+            call_command("import_books", catalog.name, stdout=out,
+                         stderr=io.StringIO())
+
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertIn("2 created", out.getvalue())
+
+
+class ImportBooksApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def upload(self, name, content, **data):
+        if isinstance(content, str):
+            content = content.encode()
+        return self.client.post(
+            IMPORT_URL,
+            {"file": SimpleUploadedFile(name, content), **data},
+            format="multipart",
+        )
+
+    def login_admin(self):
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        ))
+
+    def test_import_requires_admin(self):
+        user = get_user_model().objects.create_user("test@test.com",
+                                                    "testpass")
+        self.client.force_authenticate(user)
+
+        res = self.upload("catalog.csv", CSV_CATALOG)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Book.objects.exists())
+
+    def test_admin_import(self):
+        admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.upload("catalog.csv", CSV_CATALOG)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 2)
+        self.assertEqual(res.data["invalid"], 2)
+
+        res = self.upload("catalog.txt", jsonl(valid_row), format="jsonl",
+                          upsert="true")
+
+        self.assertEqual(res.data["updated"], 1)
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_byte_order_mark_is_skipped(self):
+        self.login_admin()
+
+        res = self.upload("catalog.csv", CSV_CATALOG.encode("utf-8-sig"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 2)
+
+    def test_invalid_utf8_imports_nothing(self):
+        self.login_admin()
+        # Larger than the text stream's buffer, in chunks that would
+        # commit before the bad line is read.
+        rows = [{**valid_row, "title": f"Book {i}"} for i in range(300)]
+
+        with mock.patch("books.views.BookImporter",
+                        partial(BookImporter, chunk_size=100)):
+            res = self.upload("catalog.jsonl",
+                              jsonl(*rows).encode() + b"\xff\n",
+                              format="jsonl")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Book.objects.exists())
+
+    def test_unknown_format(self):
+        admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.upload("catalog.txt", CSV_CATALOG)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
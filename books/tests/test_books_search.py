@@ -0,0 +1,66 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from books.models import Book
+from books.tests.factories import sample_book
+from books.search import search_books
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class BookSearchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.hobbit = sample_book(title="The Hobbit",
+                                  author="J. R. R. Tolkien")
+        self.silmarillion = sample_book(title="The Silmarillion",
+                                        author="J. R. R. Tolkien")
+        self.dune = sample_book(title="Dune", author="Frank Herbert")
+
+    def search(self, query):
+        res = self.client.get(BOOKS_URL, {"search": query})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in res.data["results"]]
+
+    def test_search_by_title(self):
+        self.assertEqual(self.search("hobbit"), [self.hobbit.id])
+
+    def test_search_by_author(self):
+        self.assertCountEqual(
+            self.search("tolkien"),
+            [self.hobbit.id, self.silmarillion.id],
+        )
+
+    def test_search_all_terms_must_match(self):
+        self.assertEqual(self.search("tolkien hobbit"), [self.hobbit.id])
+
+    def test_search_without_matches(self):
+        self.assertEqual(self.search("asimov"), [])
+
+    def test_empty_search_returns_all_books(self):
+        self.assertEqual(
+            self.search(" "),
+            [self.hobbit.id, self.silmarillion.id, self.dune.id],
+        )
+
+    def test_search_pages_through_equal_ranks(self):
+        books = [sample_book(title=f"Dune {number}", author="Frank Herbert")
+                 for number in range(5)]
+
+        ids = []
+        url, params = BOOKS_URL, {"search": "dune", "page_size": 2}
+        while url:
+            page = self.client.get(url, params).json()
+            ids += [book["id"] for book in page["results"]]
+            url, params = page["next"], None
+
+        self.assertCountEqual(ids, [self.dune.id, *[b.id for b in books]])
+        self.assertEqual(len(ids), 6)
+
+    def test_search_books_queryset(self):
+        books = search_books(Book.objects.all(), "herbert")
+
+        self.assertEqual(list(books), [self.dune])
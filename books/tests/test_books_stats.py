@@ -0,0 +1,243 @@
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from datetime import timedelta
+
+from books.models import Book
+from books.tests.factories import sample_book
+from books.pagination import BookPagination
+from borrowings.models import Borrowing
+
+BOOKS_URL = reverse("books:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BookStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.client.force_authenticate(self.user)
+
+    def checkout(self, book):
+        res = self.client.post(BORROWINGS_URL, {
+            "book": book.id,
+            "expected_return_date": timezone.now() + timedelta(days=5),
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data["id"]
+
+    def books(self, **params):
+        res = self.client.get(BOOKS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["id"] for book in res.data["results"]]
+
+    def test_checkout_and_return_update_counters(self):
+        book = sample_book()
+
+        first = self.checkout(book)
+        self.checkout(book)
+        Borrowing.objects.filter(id=first).return_books()
+
+        book.refresh_from_db()
+        self.assertEqual(book.active_loans, 1)
+        self.assertEqual(book.total_loans, 2)
+        self.assertEqual(book.last_borrowed_at,
+                         Borrowing.objects.latest("borrow_date").borrow_date)
+
+    def test_unavailable_checkout_leaves_counters(self):
+        book = sample_book(inventory=1)
+        self.checkout(book)
+
+        res = self.client.post(BORROWINGS_URL, {
+            "book": book.id,
+            "expected_return_date": timezone.now() + timedelta(days=5),
+        })
+
+        book.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual((book.active_loans, book.total_loans), (1, 1))
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_counters_exposed_read_only(self):
+        book = sample_book()
+        self.checkout(book)
+
+        res = self.client.get(reverse("books:book-detail", args=[book.id]))
+
+        self.assertEqual(res.data["active_loans"], 1)
+        self.assertEqual(res.data["total_loans"], 1)
+        self.assertIsNotNone(res.data["last_borrowed_at"])
+
+    def test_filter_by_counters(self):
+        idle = sample_book()
+        on_loan = sample_book()
+        popular = sample_book()
+        self.checkout(on_loan)
+        for _ in range(3):
+            Borrowing.objects.filter(id=self.checkout(popular)).return_books()
+
+        self.assertEqual(self.books(on_loan="true"), [on_loan.id])
+        self.assertEqual(self.books(on_loan="false"), [idle.id, popular.id])
+        self.assertEqual(self.books(min_total_loans=2), [popular.id])
+
+    def test_invalid_min_total_loans(self):
+        for value in ("-1", "1.5", "", "\u00b2"):
+            res = self.client.get(BOOKS_URL, {"min_total_loans": value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST,
+                             value)
+
+    def test_huge_min_total_loans(self):
+        sample_book(total_loans=5)
+
+        self.assertEqual(self.books(min_total_loans="9" * 30), [])
+
+    def test_sort_by_counters_across_pages(self):
+        books = [sample_book(total_loans=loans) for loans in (2, 5, 0, 5)]
+
+        res = self.client.get(BOOKS_URL, {"ordering": "-total_loans",
+                                          "page_size": 2})
+        next_page = self.client.get(res.data["next"])
+
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]]
+            + [book["id"] for book in next_page.data["results"]],
+            [books[3].id, books[1].id, books[0].id, books[2].id],
+        )
+
+    def test_sort_by_counters_pages_through_ties(self):
+        # More ties than CursorPagination could skip with its offset.
+        books = [sample_book(active_loans=loans)
+                 for loans in [0] * 7 + [1] * 2]
+        expected = [book.id for book in reversed(books)]
+
+        with mock.patch.object(BookPagination, "offset_cutoff", 3):
+            ids = []
+            url, params = BOOKS_URL, {"ordering": "-active_loans",
+                                      "page_size": 2}
+            while url:
+                res = self.client.get(url, params)
+                ids += [book["id"] for book in res.data["results"]]
+                url, params = res.data["next"], None
+
+            previous_ids = []
+            url = res.data["previous"]
+            while url:
+                res = self.client.get(url)
+                previous_ids = [
+                    book["id"] for book in res.data["results"]
+                ] + previous_ids
+                url = res.data["previous"]
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(previous_ids, expected[:-1])
+
+    def test_sort_by_last_borrowed_at(self):
+        never = sample_book()
+        first = sample_book()
+        second = sample_book()
+        self.checkout(first)
+        self.checkout(second)
+
+        # Never borrowed books come last either way.
+        self.assertEqual(self.books(ordering="-last_borrowed_at"),
+                         [second.id, first.id, never.id])
+        self.assertEqual(self.books(ordering="last_borrowed_at"),
+                         [first.id, second.id, never.id])
+
+    def test_sort_by_last_borrowed_at_pages_through_never_borrowed(self):
+        books = [sample_book() for _ in range(5)]
+        self.checkout(books[3])
+        self.checkout(books[1])
+        expected = [books[1].id, books[3].id,
+                    books[4].id, books[2].id, books[0].id]
+
+        ids = []
+        url, params = BOOKS_URL, {"ordering": "-last_borrowed_at",
+                                  "page_size": 2}
+        while url:
+            res = self.client.get(url, params)
+            ids += [book["id"] for book in res.data["results"]]
+            url, params = res.data["next"], None
+
+        previous_ids = []
+        url = res.data["previous"]
+        while url:
+            res = self.client.get(url)
+            previous_ids = [
+                book["id"] for book in res.data["results"]
+            ] + previous_ids
+            url = res.data["previous"]
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(previous_ids, expected[:-1])
+
+    def test_sort_search_results(self):
+        sample_book(title="Dune", total_loans=1)
+        messiah = sample_book(title="Dune Messiah", total_loans=7)
+        sample_book(title="Emma", total_loans=9)
+
+        ids = self.books(search="dune", ordering="-total_loans")
+
+        self.assertEqual(ids[0], messiah.id)
+        self.assertEqual(len(ids), 2)
+
+
+class ReconcileBookStatsTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.book = sample_book()
+        self.in_sync = sample_book()
+        for book in (self.book, self.book, self.in_sync):
+            Borrowing.objects.create(
+                book=book,
+                expected_return_date=timezone.now() + timedelta(days=5),
+                user=user,
+            )
+        Borrowing.objects.filter(
+            id=Borrowing.objects.filter(book=self.book).first().id
+        ).update(actual_return_date=timezone.now())
+        Book.objects.filter(id=self.in_sync.id).update(
+            active_loans=1, total_loans=1,
+            last_borrowed_at=Borrowing.objects.get(
+                book=self.in_sync).borrow_date,
+        )
+
+    def reconcile(self, **options):
+        out = io.StringIO()
+        call_command("reconcile_book_stats", stdout=out, **options)
+        return out.getvalue()
+
+    def test_reports_and_fixes_drift(self):
+        self.assertIn("1 books had drifted stats.", self.reconcile())
+
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.active_loans, self.book.total_loans),
+                         (1, 2))
+        self.assertEqual(
+            self.book.last_borrowed_at,
+            Borrowing.objects.filter(book=self.book)
+            .latest("borrow_date").borrow_date,
+        )
+        self.assertIn("0 books had drifted stats.", self.reconcile())
+
+    def test_dry_run(self):
+        out = self.reconcile(dry_run=True, verbosity=2)
+
+        self.book.refresh_from_db()
+        self.assertIn(f"Book {self.book.id}: active_loans 0 -> 1", out)
+        self.assertIn("1 books have drifted stats.", out)
+        self.assertEqual(self.book.total_loans, 0)
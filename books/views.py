@@ -1,11 +1,88 @@
+import io
+from functools import partial
+
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
+from books.cache import CatalogCacheMixin, get_book_updated_at
+from books.filters import BookStatsFilter
+from books.importer import (
+    ENCODING,
+    BookImporter,
+    check_encoding,
+    iter_rows,
+)
 from books.models import Book
+from books.pagination import BookPagination
 from books.permissions import IsAdminOrReadOnly
-from books.serializers import BookSerializer
+from books.search import BookSearchFilter
+from books.serializers import BookImportSerializer, BookSerializer
+from library_service.conditional import conditional_response, make_etag
+from library_service.fast_serialization import FastListMixin
+from library_service.replicas import ReplicaReadMixin
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(
+    ReplicaReadMixin,
+    CatalogCacheMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = BookPagination
+    filter_backends = [BookStatsFilter, BookSearchFilter]
+
+    def get_serializer_class(self):
+        if self.action == "import_books":
+            return BookImportSerializer
+
+        return BookSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        render = partial(super().retrieve, request, *args, **kwargs)
+
+        updated_at = get_book_updated_at(kwargs["pk"])
+
+        if updated_at is None:
+            return render()
+
+        return conditional_response(
+            request,
+            render,
+            etag=make_etag("book", kwargs["pk"], updated_at,
+                           request.accepted_renderer.format),
+            last_modified=updated_at,
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser],
+    )
+    def import_books(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        upload = data["file"]
+
+        # Every chunk commits on its own, so a decoding error half way
+        # would leave a partial import behind.
+        try:
+            check_encoding(upload.chunks())
+        except UnicodeDecodeError:
+            raise ValidationError({"file": "Not valid UTF-8."})
+
+        upload.seek(0)
+        stream = io.TextIOWrapper(upload.file, encoding=ENCODING, newline="")
+        importer = BookImporter(upsert=data["upsert"])
+
+        return Response(importer.run(iter_rows(stream, data["format"])))
@@ -2,4 +2,15 @@ from django.contrib import admin
 
 from borrowings.models import Borrowing
 
-admin.site.register(Borrowing)
+
+@admin.register(Borrowing)
+class BorrowingAdmin(admin.ModelAdmin):
+    list_display = ("id", "book", "user", "borrow_date",
+                    "expected_return_date", "actual_return_date")
+    list_select_related = ("book", "user")
+    actions = ("return_books",)
+
+    @admin.action(description="Mark selected borrowings as returned")
+    def return_books(self, request, queryset):
+        returned = queryset.return_books()
+        self.message_user(request, f"{len(returned)} borrowing(s) returned.")
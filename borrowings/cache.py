@@ -0,0 +1,52 @@
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+BORROWINGS_VERSION_KEY = "borrowings:version"
+# Borrowing lists show book titles.
+BOOKS_VERSION_KEY = "borrowings:books-version"
+
+
+def user_version_key(user_id):
+    return f"borrowings:version:{user_id}"
+
+
+def set_versions(keys):
+    cache.set_many(dict.fromkeys(keys, time.time_ns()), timeout=None)
+
+
+def bump_versions(keys):
+    """Bump now and again once the surrounding transaction commits, so a
+    marker read from the pre-commit state is never served later."""
+    set_versions(keys)
+    transaction.on_commit(partial(set_versions, keys))
+
+
+def bump_borrowings_version(user_ids):
+    """Invalidate the borrowing lists of staff and of ``user_ids``."""
+    bump_versions(
+        [BORROWINGS_VERSION_KEY, *map(user_version_key, set(user_ids))]
+    )
+
+
+def bump_books_version():
+    bump_versions([BOOKS_VERSION_KEY])
+
+
+def get_borrowings_version(user):
+    """Change marker of the borrowings listed to ``user``: everyone's for
+    staff, their own otherwise. Costs one cache lookup and no queries."""
+    keys = [
+        BOOKS_VERSION_KEY,
+        BORROWINGS_VERSION_KEY if user.is_staff else user_version_key(user.id),
+    ]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        set_versions(missing)
+        versions.update(cache.get_many(missing))
+
+    return tuple(versions.get(key) for key in keys)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from borrowings.export import EXPORT_FORMATS, export_rows
+from borrowings.models import Borrowing
+
+
+class Command(BaseCommand):
+    help = "Stream the borrowing history as CSV or NDJSON."  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS,
+                            default="csv")
+        parser.add_argument("--user-id", type=int)
+        parser.add_argument("--is-active", choices=("true", "false"))
+        parser.add_argument("--output", help="Defaults to stdout.")
+
+    def handle(self, *args, **options):
+        queryset = Borrowing.objects.all()
+
+        if options["user_id"] is not None:
+            queryset = queryset.filter(user_id=options["user_id"])
+
+        if options["is_active"] is not None:
+            queryset = queryset.filter(
+                actual_return_date__isnull=options["is_active"] == "true"
+            )
+
+        iter_export, _ = EXPORT_FORMATS[options["format"]]
+        chunks = iter_export(export_rows(queryset))
+
+        if options["output"] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="",
+                  encoding="utf-8") as output:
+            for chunk in chunks:
+                output.write(chunk)
@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from borrowings.export import format_datetime
+from borrowings.models import Borrowing
+
+FIELDS = ("id", "user_id", "user__email", "book_id", "book__title",
+          "expected_return_date", "days_overdue", "fine")
+
+
+def overdue_batches(batch_size, now):
+    """Yield overdue borrowings in id order, ``batch_size`` rows at a time.
+
+    Every batch is a separate keyset query (``id > last seen id``), so
+    memory is bounded by the batch size however many loans are overdue.
+    """
+    queryset = Borrowing.objects.overdue_fines(now).order_by("id")
+    last_id = 0
+
+    while True:
+        batch = list(
+            queryset.filter(id__gt=last_id).values(*FIELDS)[:batch_size]
+        )
+        if not batch:
+            return
+
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1]["id"]
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compute fines for overdue borrowings and print one NDJSON notice "
+        "per loan. Meant to run nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        loans = 0
+        fines = 0
+
+        for batch in overdue_batches(options["batch_size"], now):
+            lines = []
+            for row in batch:
+                row["expected_return_date"] = format_datetime(
+                    row["expected_return_date"]
+                )
+                fines += row["fine"]
+                row["fine"] = f"{row['fine']:.2f}"
+                lines.append(json.dumps(row, ensure_ascii=False))
+
+            self.stdout.write("\n".join(lines))
+            loans += len(batch)
+
+        self.stderr.write(
+            f"{loans} overdue borrowings, {fines or 0:.2f} in fines."
+        )
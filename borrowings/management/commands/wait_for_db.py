@@ -1,17 +0,0 @@
-import time
-from django.db import connections
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
-
-
-class Command(BaseCommand):
-    def handle(self, *args, **options):
-        self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
-            try:
-                db_conn = connections["default"]
-                self.stdout.write(self.style.SUCCESS("Database available!"))
-            except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
@@ -0,0 +1,37 @@
+# Generated by Django 4.0.4 on 2026-10-18 09:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('borrowings', '0003_borrowing_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['user', 'actual_return_date'], name='borrowing_user_return_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(condition=models.Q(('actual_return_date__isnull', True)), fields=['user', '-borrow_date'], name='borrowing_active_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['-borrow_date'], name='borrowing_borrow_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['expected_return_date'], name='borrowing_expected_return_idx'),
+        ),
+        migrations.AlterField(
+            model_name='borrowing',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
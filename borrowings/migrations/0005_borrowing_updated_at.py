@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('borrowings', '0004_borrowing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borrowing',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0.4 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('borrowings', '0005_borrowing_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['updated_at'], name='borrowing_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['actual_return_date'], name='borrowing_returned_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.4 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('borrowings', '0006_borrowing_change_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='borrowing',
+            name='borrowing_active_user_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='borrowing',
+            name='borrowing_borrow_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(condition=models.Q(('actual_return_date__isnull', True)), fields=['user', '-borrow_date', '-id'], name='borrowing_active_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['-borrow_date', '-id'], name='borrowing_borrow_date_idx'),
+        ),
+    ]
@@ -1,19 +1,161 @@
+from collections import Counter
+from decimal import Decimal
+
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
 from rest_framework.exceptions import ValidationError
 
+from books.cache import bump_catalog_version
 from books.models import Book
+from borrowings.cache import bump_borrowings_version
 from library_service import settings
 
 
+FINE_FIELD = models.DecimalField(max_digits=12, decimal_places=2)
+
+
+class DaysBetween(models.Func):
+    """Number of calendar days (UTC) from the second argument to the first.
+    """
+    arity = 2
+    output_field = models.IntegerField()
+    template = "(CAST(%(expressions)s AS date))"
+    arg_joiner = " AS date) - CAST("
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(date(%(expressions)s)) AS integer)",
+            arg_joiner=")) - julianday(date(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="DATEDIFF",
+                           template="%(function)s(%(expressions)s)",
+                           arg_joiner=", ", **extra_context)
+
+
+def overdue_condition(now=None):
+    return Q(actual_return_date__isnull=True,
+             expected_return_date__lt=now or timezone.now())
+
+
+class BorrowingQuerySet(models.QuerySet):
+    def overdue(self, now=None):
+        return self.filter(overdue_condition(now))
+
+    def overdue_fines(self, now=None):
+        """Overdue borrowings annotated with ``days_overdue`` and ``fine``.
+
+        A day is charged for every calendar day past the expected return
+        date, at the book's daily fee; both are computed by the database.
+        """
+        now = now or timezone.now()
+
+        return self.overdue(now).annotate(
+            days_overdue=DaysBetween(
+                Value(now, output_field=models.DateTimeField()),
+                "expected_return_date",
+            ),
+            fine=ExpressionWrapper(F("days_overdue") * F("book__daily_fee"),
+                                   output_field=FINE_FIELD),
+        )
+
+    def fines_summary(self, now=None):
+        """Count, days overdue and outstanding fines in a single query."""
+        return self.overdue_fines(now).aggregate(
+            overdue=Count("id"),
+            overdue_days=Coalesce(Sum("days_overdue"), 0),
+            fines=Coalesce(Sum("fine"), Value(Decimal("0")),
+                           output_field=FINE_FIELD),
+        )
+
+    def return_books(self):
+        """Mark active borrowings as returned and restock their books.
+
+        Runs a fixed number of statements regardless of how many rows
+        match, and returns the ids of borrowings that were returned.
+        """
+        with transaction.atomic():
+            returned = list(
+                self.filter(actual_return_date__isnull=True)
+                .select_for_update()
+                .values_list("id", "book_id", "user_id")
+            )
+
+            if not returned:
+                return []
+
+            ids = [borrowing_id for borrowing_id, _, _ in returned]
+            now = timezone.now()
+            Borrowing.objects.filter(id__in=ids).update(
+                actual_return_date=now, updated_at=now
+            )
+
+            copies = Counter(book_id for _, book_id, _ in returned)
+            returned_copies = Case(
+                *[When(id=book_id, then=Value(count))
+                  for book_id, count in copies.items()]
+            )
+            Book.objects.filter(id__in=copies).update(
+                inventory=F("inventory") + returned_copies,
+                # Clamped so that borrowings created outside checkout
+                # (admin, fixtures) cannot make a return fail; the drift
+                # is left for reconcile_book_stats to report.
+                active_loans=Greatest(F("active_loans") - returned_copies, 0),
+                updated_at=now,
+            )
+            bump_catalog_version()
+            bump_borrowings_version(user_id for _, _, user_id in returned)
+
+        return ids
+
+
 class Borrowing(models.Model):
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     borrow_date = models.DateTimeField(auto_now_add=True)
     expected_return_date = models.DateTimeField(null=False)
     actual_return_date = models.DateTimeField(null=True,
                                               blank=True, default=None)
+    # Indexed through the composite indexes below, which lead with user.
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
-                             on_delete=models.CASCADE)
+                             on_delete=models.CASCADE, db_index=False)
+    # Change marker for conditional requests, set explicitly by bulk updates.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BorrowingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "actual_return_date"],
+                         name="borrowing_user_return_idx"),
+            # Follow the list ordering, see BorrowingPagination.
+            models.Index(fields=["user", "-borrow_date", "-id"],
+                         condition=Q(actual_return_date__isnull=True),
+                         name="borrowing_active_user_idx"),
+            models.Index(fields=["-borrow_date", "-id"],
+                         name="borrowing_borrow_date_idx"),
+            models.Index(fields=["expected_return_date"],
+                         name="borrowing_expected_return_idx"),
+            # Used by the analytics refresh to find changed days.
+            models.Index(fields=["updated_at"],
+                         name="borrowing_updated_at_idx"),
+            models.Index(fields=["actual_return_date"],
+                         name="borrowing_returned_idx"),
+        ]
 
     def clean(self):
         super().clean()
@@ -40,7 +182,3 @@ class Borrowing(models.Model):
     @property
     def is_active(self):
         return self.actual_return_date is None
-
-    @property
-    def user_id(self):
-        return self.user.id
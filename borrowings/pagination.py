@@ -0,0 +1,9 @@
+from library_service.pagination import KeysetCursorPagination
+
+
+class BorrowingPagination(KeysetCursorPagination):
+    # Bulk-created borrowings share their borrow date, the id breaks ties.
+    ordering = ("-borrow_date", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from django.utils import timezone
+from django.db import transaction
+from django.db.models import F
 
+from books.cache import bump_catalog_version
+from books.models import Book
 from books.serializers import BookSerializer
 from borrowings.models import Borrowing
 
@@ -60,8 +63,44 @@ class CreateBorrowingSerializer(BorrowingSerializer):
     def create(self, validated_data):
         request = self.context.get("request")
         user = request.user
-        borrowing = Borrowing.objects.create(user=user, **validated_data)
         book = validated_data["book"]
-        book.inventory -= 1
-        book.save()
+
+        with transaction.atomic():
+            borrowing = Borrowing.objects.create(user=user, **validated_data)
+
+            # Decrement in the database so concurrent checkouts of the same
+            # book can never drive the inventory below zero. Raising rolls
+            # the borrowing back.
+            updated = Book.objects.filter(
+                pk=book.pk, inventory__gt=0
+            ).update(
+                inventory=F("inventory") - 1,
+                active_loans=F("active_loans") + 1,
+                total_loans=F("total_loans") + 1,
+                last_borrowed_at=borrowing.borrow_date,
+                updated_at=borrowing.borrow_date,
+            )
+
+            if not updated:
+                raise ValidationError(
+                    {"book": "This book is not available for borrowing."}
+                )
+
+            bump_catalog_version()
+
         return borrowing
+
+
+class BulkReturnSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
+class FinesSummarySerializer(serializers.Serializer):
+    overdue = serializers.IntegerField(read_only=True)
+    overdue_days = serializers.IntegerField(read_only=True)
+    fines = serializers.DecimalField(max_digits=12, decimal_places=2,
+                                     read_only=True)
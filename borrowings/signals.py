@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.models import Book
+from borrowings.cache import bump_books_version, bump_borrowings_version
+from borrowings.models import Borrowing
+
+
+@receiver(post_save, sender=Borrowing)
+@receiver(post_delete, sender=Borrowing)
+def invalidate_borrowing_lists(sender, instance, **kwargs):
+    bump_borrowings_version([instance.user_id])
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_titles(sender, **kwargs):
+    bump_books_version()
@@ -1,17 +1,26 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from books.models import Book
+from books.tests.factories import sample_book
 
-from rest_framework.test import APIClient
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
 
 from datetime import datetime, timedelta
 
 from borrowings.models import Borrowing
-from borrowings.serializers import BorrowingListSerializer, BorrowingDetailsSerializer
+from borrowings.pagination import BorrowingPagination
+from borrowings.serializers import (
+    BorrowingListSerializer,
+    BorrowingDetailsSerializer,
+    CreateBorrowingSerializer,
+)
 
 BOOKS_URL = reverse("books:book-list")
 BORROWINGS_URL = reverse("borrowings:borrowing-list")
@@ -28,22 +37,15 @@ expected_return_date = datetime.now() + timedelta(days=5)
 expected_return_date_zone_aware = timezone.now() + timedelta(days=5)
 
 
-def sample_book(**params):
-    defaults = {
-        "title": "Sample book",
-        "author": "Sample author",
-        "cover": "SOFT",
-        "inventory": 5,
-        "daily_fee": 2.05
-    }
+def detail_url(borrowing_id):
+    return reverse("borrowings:borrowing-detail", args=[borrowing_id])
 
-    defaults.update(params)
 
-    return Book.objects.create(**defaults)
+def return_url(borrowing_id):
+    return reverse("borrowings:borrowing-return-book", args=[borrowing_id])
 
 
-def detail_url(borrowing_id):
-    return reverse("borrowings:borrowing-detail", args=[borrowing_id])
+BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
 
 
 class UnauthenticatedBorrowingsApiTests(TestCase):
@@ -115,6 +117,41 @@ class AuthenticatedBorrowingsApiTests(TestCase):
         book.refresh_from_db()
         self.assertEqual(book.inventory, initial_inventory - 1)
 
+    def test_create_borrowing_unavailable_book(self):
+        book = sample_book(inventory=0)
+
+        res = self.client.post(BORROWINGS_URL, {
+            "book": book.id,
+            "expected_return_date": expected_return_date,
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_create_borrowing_does_not_oversell(self):
+        book = sample_book(inventory=1)
+        request = APIRequestFactory().post(BORROWINGS_URL)
+        request.user = self.user
+
+        serializer = CreateBorrowingSerializer(
+            data={
+                "book": book.id,
+                "expected_return_date": expected_return_date_zone_aware,
+            },
+            context={"request": request},
+        )
+        self.assertTrue(serializer.is_valid())
+
+        # Another checkout takes the last copy after validation passed.
+        Book.objects.filter(id=book.id).update(inventory=0)
+
+        with self.assertRaises(ValidationError):
+            serializer.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 0)
+        self.assertFalse(Borrowing.objects.exists())
+
     def test_list_borrowings(self):
         book = sample_book()
 
@@ -127,7 +164,7 @@ class AuthenticatedBorrowingsApiTests(TestCase):
 
         res = self.client.get(BORROWINGS_URL)
 
-        borrowings = Borrowing.objects.order_by("id")
+        borrowings = Borrowing.objects.order_by("-borrow_date", "-id")
         serializer = BorrowingListSerializer(borrowings, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -135,7 +172,7 @@ class AuthenticatedBorrowingsApiTests(TestCase):
         for item in serializer.data:
             item.pop('user_id', None)
 
-        self.assertEqual(serializer.data, res.data)
+        self.assertEqual(serializer.data, res.data["results"])
 
     def test_filter_borrowings_by_activeness(self):
         book = sample_book()
@@ -151,7 +188,7 @@ class AuthenticatedBorrowingsApiTests(TestCase):
 
         res = self.client.get(BORROWINGS_URL, {"is_active": "true"})
 
-        returned_ids = [item['id'] for item in res.data]
+        returned_ids = [item['id'] for item in res.data["results"]]
 
         self.assertIn(first_borrowing.id, returned_ids)
         self.assertNotIn(second_borrowing.id, returned_ids)
@@ -197,9 +234,9 @@ class AuthenticatedBorrowingsApiTests(TestCase):
         res = self.client.get(BORROWINGS_URL)
 
         user_borrowings_ids = [user_borrowing_res.data["id"]]
-        returned_ids = [item["id"] for item in res.data]
+        returned_ids = [item["id"] for item in res.data["results"]]
 
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data["results"]), 1)
         self.assertEqual(returned_ids, user_borrowings_ids)
 
     def test_user_can_only_see_own_borrowing_details(self):
@@ -231,6 +268,56 @@ class AuthenticatedBorrowingsApiTests(TestCase):
         self.assertEqual(own_borrowing_res.status_code, status.HTTP_200_OK)
 
 
+    def test_return_borrowing(self):
+        book = sample_book(inventory=0)
+        borrowing = Borrowing.objects.create(
+            book=book, expected_return_date=expected_return_date_zone_aware,
+            user=self.user)
+
+        res = self.client.post(return_url(borrowing.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(res.data["actual_return_date"])
+        self.assertEqual(res.data["book"]["inventory"], 1)
+
+        borrowing.refresh_from_db()
+        book.refresh_from_db()
+        self.assertFalse(borrowing.is_active)
+        self.assertEqual(book.inventory, 1)
+
+    def test_return_borrowing_twice(self):
+        book = sample_book(inventory=0)
+        borrowing = Borrowing.objects.create(
+            book=book, expected_return_date=expected_return_date_zone_aware,
+            user=self.user)
+
+        self.client.post(return_url(borrowing.id))
+        res = self.client.post(return_url(borrowing.id))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 1)
+
+    def test_user_cannot_return_other_user_borrowing(self):
+        other_user = get_user_model().objects.create_user(
+            "other@test.com",
+            "testpass",
+        )
+        borrowing = Borrowing.objects.create(
+            book=sample_book(),
+            expected_return_date=expected_return_date_zone_aware,
+            user=other_user)
+
+        res = self.client.post(return_url(borrowing.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_return_forbidden(self):
+        res = self.client.post(BULK_RETURN_URL, {"ids": [1]}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class AdminBorrowingsApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -263,12 +350,12 @@ class AdminBorrowingsApiTests(TestCase):
         res = self.client.get(BORROWINGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data["results"]), 2)
 
     def test_filter_borrowings_by_user_id(self):
         res = self.client.get(BORROWINGS_URL, {"user_id": self.first_user.id})
 
-        returned_ids = [item['id'] for item in res.data]
+        returned_ids = [item['id'] for item in res.data["results"]]
 
         self.assertIn(self.first_borrowing.id, returned_ids)
         self.assertNotIn(self.second_borrowing.id, returned_ids)
@@ -283,3 +370,119 @@ class AdminBorrowingsApiTests(TestCase):
         second_borrowing_res = self.client.get(second_borrowing_url)
 
         self.assertEqual(second_borrowing_res.status_code, status.HTTP_200_OK)
+
+    def test_bulk_return(self):
+        book = self.first_borrowing.book
+        extra_borrowings = [
+            Borrowing.objects.create(
+                book=book,
+                expected_return_date=expected_return_date_zone_aware,
+                user=self.second_user,
+            )
+            for _ in range(3)
+        ]
+        ids = [self.first_borrowing.id, self.second_borrowing.id] + [
+            borrowing.id for borrowing in extra_borrowings
+        ]
+
+        # Throttle bucket, savepoint, select, two updates and release,
+        # whatever the row count.
+        with self.assertNumQueries(6):
+            res = self.client.post(BULK_RETURN_URL, {"ids": ids},
+                                   format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(res.data["returned"]), sorted(ids))
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+
+        book.refresh_from_db()
+        self.second_borrowing.book.refresh_from_db()
+        self.assertEqual(book.inventory, 5 + 4)
+        self.assertEqual(self.second_borrowing.book.inventory, 5 + 1)
+
+    def test_bulk_return_skips_returned_borrowings(self):
+        self.client.post(BULK_RETURN_URL, {"ids": [self.first_borrowing.id]},
+                         format="json")
+
+        res = self.client.post(
+            BULK_RETURN_URL,
+            {"ids": [self.first_borrowing.id, self.second_borrowing.id]},
+            format="json",
+        )
+
+        self.assertEqual(res.data["returned"], [self.second_borrowing.id])
+
+        book = Book.objects.get(id=self.first_borrowing.book_id)
+        self.assertEqual(book.inventory, 6)
+
+    def test_list_borrowings_paginated(self):
+        for _ in range(3):
+            Borrowing.objects.create(
+                book=sample_book(),
+                expected_return_date=expected_return_date_zone_aware,
+                user=self.first_user,
+            )
+
+        first_page = self.client.get(BORROWINGS_URL, {"page_size": 2})
+        second_page = self.client.get(first_page.data["next"])
+        last_page = self.client.get(second_page.data["next"])
+
+        returned_ids = [
+            item["id"]
+            for page in (first_page, second_page, last_page)
+            for item in page.data["results"]
+        ]
+        expected_ids = list(
+            Borrowing.objects.order_by("-borrow_date", "-id")
+            .values_list("id", flat=True)
+        )
+
+        self.assertEqual(len(first_page.data["results"]), 2)
+        self.assertIsNone(last_page.data["next"])
+        self.assertEqual(returned_ids, expected_ids)
+
+    def test_list_borrowings_page_size_is_capped(self):
+        book = sample_book()
+        Borrowing.objects.bulk_create([
+            Borrowing(
+                book=book,
+                expected_return_date=expected_return_date_zone_aware,
+                user=self.first_user,
+            )
+            for _ in range(BorrowingPagination.max_page_size)
+        ])
+
+        res = self.client.get(BORROWINGS_URL, {"page_size": 10 ** 6})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]),
+                         BorrowingPagination.max_page_size)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_list_borrowings_pages_through_equal_borrow_dates(self):
+        book = sample_book()
+        Borrowing.objects.bulk_create([
+            Borrowing(
+                book=book,
+                expected_return_date=expected_return_date_zone_aware,
+                user=self.first_user,
+            )
+            for _ in range(7)
+        ])
+        Borrowing.objects.update(borrow_date=timezone.now())
+        expected_ids = list(
+            Borrowing.objects.order_by("-id").values_list("id", flat=True)
+        )
+
+        # More ties than CursorPagination could skip with its offset.
+        with mock.patch.object(BorrowingPagination, "offset_cutoff", 3):
+            returned_ids = []
+            url, params = BORROWINGS_URL, {"page_size": 2}
+            while url:
+                res = self.client.get(url, params)
+                returned_ids += [item["id"] for item in res.data["results"]]
+                url, params = res.data["next"], None
+
+        self.assertEqual(returned_ids, expected_ids)
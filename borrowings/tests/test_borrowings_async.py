@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from datetime import timedelta
+
+from books.tests.factories import sample_book
+from borrowings.models import Borrowing
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class AsgiBorrowingsApiTests(TestCase):
+    """The borrowing endpoints served through Django's ASGI handler."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass"
+        )
+        book = sample_book()
+        self.borrowing, self.other_borrowing = [
+            Borrowing.objects.create(
+                book=book,
+                expected_return_date=timezone.now() + timedelta(days=5),
+                user=user,
+            )
+            for user in (self.user, other_user)
+        ]
+        self.auth = {"authorize": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    async def test_auth_required(self):
+        res = await self.async_client.get(BORROWINGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_list_matches_wsgi(self):
+        self.client.force_authenticate(self.user)
+
+        async_res = await self.async_client.get(
+            BORROWINGS_URL, {"is_active": "true"}, **self.auth
+        )
+        sync_res = await sync_to_async(self.client.get)(
+            BORROWINGS_URL, {"is_active": "true"}
+        )
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json()["results"],
+                         sync_res.json()["results"])
+        self.assertEqual(len(async_res.json()["results"]), 1)
+
+    async def test_detail_permissions(self):
+        own = await self.async_client.get(
+            reverse("borrowings:borrowing-detail", args=[self.borrowing.id]),
+            **self.auth,
+        )
+        other = await self.async_client.get(
+            reverse("borrowings:borrowing-detail",
+                    args=[self.other_borrowing.id]),
+            **self.auth,
+        )
+
+        self.assertEqual(own.status_code, status.HTTP_200_OK)
+        self.assertEqual(own.json()["id"], self.borrowing.id)
+        self.assertEqual(other.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,149 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import time
+from datetime import timedelta
+
+from books.tests.factories import sample_book
+from borrowings.models import Borrowing
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BorrowingsConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = sample_book()
+        self.borrowing = Borrowing.objects.create(
+            book=self.book,
+            expected_return_date=timezone.now() + timedelta(days=5),
+            user=self.user,
+        )
+
+    def get_etag(self, params=None):
+        res = self.client.get(BORROWINGS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res["ETag"]
+
+    def poll(self, etag, params=None):
+        return self.client.get(BORROWINGS_URL, params,
+                               HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_not_modified(self):
+        etag = self.get_etag({"is_active": "true"})
+
+        # Only the throttle bucket is queried, the change marker is in the
+        # cache and the page is never built.
+        with self.assertNumQueries(1):
+            res = self.poll(etag, {"is_active": "true"})
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_modified_after_return(self):
+        etag = self.get_etag({"is_active": "true"})
+
+        Borrowing.objects.filter(id=self.borrowing.id).return_books()
+
+        res = self.poll(etag, {"is_active": "true"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [])
+
+    def test_list_modified_after_new_borrowing(self):
+        etag = self.get_etag()
+
+        Borrowing.objects.create(
+            book=self.book,
+            expected_return_date=timezone.now() + timedelta(days=5),
+            user=self.user,
+        )
+
+        self.assertEqual(self.poll(etag).status_code, status.HTTP_200_OK)
+
+    def test_list_modified_after_deletion(self):
+        etag = self.get_etag()
+
+        self.borrowing.delete()
+
+        self.assertEqual(self.poll(etag).status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified_by_other_users(self):
+        etag = self.get_etag()
+
+        other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass"
+        )
+        Borrowing.objects.create(
+            book=self.book,
+            expected_return_date=timezone.now() + timedelta(days=5),
+            user=other_user,
+        )
+
+        self.assertEqual(self.poll(etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+    def test_staff_list_modified_by_any_user(self):
+        staff = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(staff)
+        etag = self.get_etag()
+
+        Borrowing.objects.filter(id=self.borrowing.id).return_books()
+
+        self.assertEqual(self.poll(etag).status_code, status.HTTP_200_OK)
+
+    def test_list_modified_after_book_rename(self):
+        etag = self.get_etag()
+
+        self.book.title = "Renamed"
+        self.book.save()
+
+        res = self.poll(etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["book"], "Renamed")
+
+    def test_overdue_list_is_not_conditional(self):
+        res = self.client.get(BORROWINGS_URL, {"overdue": "true"})
+
+        self.assertFalse(res.has_header("ETag"))
+
+    def test_list_has_no_last_modified(self):
+        res = self.client.get(BORROWINGS_URL)
+        self.assertFalse(res.has_header("Last-Modified"))
+
+        self.borrowing.delete()
+
+        res = self.client.get(
+            BORROWINGS_URL,
+            HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60),
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_filters(self):
+        etag = self.get_etag({"is_active": "true"})
+
+        res = self.poll(etag, {"is_active": "false"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_is_per_user(self):
+        etag = self.get_etag()
+
+        other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass"
+        )
+        self.client.force_authenticate(other_user)
+
+        self.assertEqual(self.poll(etag).status_code, status.HTTP_200_OK)
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from datetime import timedelta
+
+from books.tests.factories import sample_book
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingListSerializer
+
+EXPORT_URL = reverse("borrowings:borrowing-export")
+
+
+class BorrowingsExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass"
+        )
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+        book = sample_book(title="Dune, part one")
+        self.borrowings = [
+            Borrowing.objects.create(
+                book=book,
+                expected_return_date=timezone.now() + timedelta(days=5),
+                user=user,
+            )
+            for user in (self.user, self.user, self.other_user)
+        ]
+        Borrowing.objects.filter(id=self.borrowings[1].id).return_books()
+
+    def export(self, **params):
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return b"".join(res.streaming_content).decode()
+
+    def test_export_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export())))
+
+        self.assertEqual([int(row["id"]) for row in rows],
+                         [borrowing.id for borrowing in self.borrowings])
+        self.assertEqual(rows[0]["book_title"], "Dune, part one")
+        self.assertEqual(rows[0]["actual_return_date"], "")
+        self.assertNotEqual(rows[1]["actual_return_date"], "")
+
+    def test_export_ndjson_matches_api_representation(self):
+        content = self.export(export_format="ndjson")
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        borrowing = Borrowing.objects.get(id=self.borrowings[1].id)
+        expected = BorrowingListSerializer(borrowing).data
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1]["book_title"], expected["book"])
+        for field in ("id", "user_id", "borrow_date",
+                      "expected_return_date", "actual_return_date"):
+            self.assertEqual(rows[1][field], expected[field])
+
+    def test_export_filters(self):
+        content = self.export(export_format="ndjson", is_active="true",
+                              user_id=self.user.id)
+        ids = [json.loads(line)["id"] for line in content.splitlines()]
+
+        self.assertEqual(ids, [self.borrowings[0].id])
+
+    def test_export_accepts_csv_media_type(self):
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT="text/csv")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+
+    def test_export_unknown_format(self):
+        res = self.client.get(EXPORT_URL, {"export_format": "xlsx"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_forbidden_for_users(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        out = io.StringIO()
+
+        call_command("export_borrowings", "--format", "ndjson",
+                     "--is-active", "false", stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows],
+                         [self.borrowings[1].id])
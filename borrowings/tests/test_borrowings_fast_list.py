@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from datetime import timedelta
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.views import BorrowingViewSet
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BorrowingFastListTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        book = Book.objects.create(title="Sample book",
+                                   author="Sample author", cover="SOFT",
+                                   inventory=5, daily_fee=2.05)
+        borrowings = [
+            Borrowing.objects.create(
+                book=book,
+                expected_return_date=timezone.now() + timedelta(days=5),
+                user=self.user,
+            )
+            for _ in range(3)
+        ]
+        Borrowing.objects.filter(id=borrowings[0].id).return_books()
+
+    def get_both(self, user, params):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        fast = client.get(BORROWINGS_URL, params)
+        with mock.patch.object(BorrowingViewSet, "fast_list", False):
+            slow = client.get(BORROWINGS_URL, params)
+
+        return fast, slow
+
+    def test_same_json_as_serializer(self):
+        for user in (self.user, self.admin):
+            for params in ({}, {"page_size": 2}, {"is_active": "false"}):
+                fast, slow = self.get_both(user, params)
+
+                self.assertEqual(fast.content, slow.content)
+
+    def test_user_id_only_for_admins(self):
+        user_res, _ = self.get_both(self.user, {})
+        admin_res, _ = self.get_both(self.admin, {})
+
+        self.assertNotIn("user_id", user_res.data["results"][0])
+        self.assertEqual(admin_res.data["results"][0]["user_id"],
+                         self.user.id)
@@ -0,0 +1,142 @@
+import io
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from datetime import timedelta
+
+from books.tests.factories import sample_book
+from borrowings.models import Borrowing
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+FINES_URL = reverse("borrowings:borrowing-fines")
+THROTTLE_QUERIES = 1
+
+
+def sample_borrowing(user, book, days_overdue):
+    borrowing = Borrowing.objects.create(
+        book=book,
+        expected_return_date=timezone.now() + timedelta(days=5),
+        user=user,
+    )
+    # Past expected dates are rejected by Borrowing.clean().
+    Borrowing.objects.filter(id=borrowing.id).update(
+        expected_return_date=timezone.now() - timedelta(days=days_overdue)
+    )
+    return borrowing
+
+
+class BorrowingFinesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass"
+        )
+        cheap = sample_book(daily_fee=Decimal("1.50"))
+        expensive = sample_book(title="Dune", daily_fee=Decimal("2.05"))
+
+        self.overdue = [
+            sample_borrowing(self.user, cheap, days_overdue=3),
+            sample_borrowing(self.user, expensive, days_overdue=2),
+            sample_borrowing(self.other_user, expensive, days_overdue=10),
+        ]
+        self.on_time = sample_borrowing(self.user, cheap, days_overdue=-3)
+        returned = sample_borrowing(self.user, cheap, days_overdue=4)
+        Borrowing.objects.filter(id=returned.id).return_books()
+
+    def test_overdue_fines_computed_by_database(self):
+        fines = {
+            borrowing.id: (borrowing.days_overdue, borrowing.fine)
+            for borrowing in Borrowing.objects.overdue_fines()
+        }
+
+        self.assertEqual(fines, {
+            self.overdue[0].id: (3, Decimal("4.50")),
+            self.overdue[1].id: (2, Decimal("4.10")),
+            self.overdue[2].id: (10, Decimal("20.50")),
+        })
+
+    def test_filter_overdue(self):
+        self.client.force_authenticate(self.user)
+
+        overdue = self.client.get(BORROWINGS_URL, {"overdue": "true"})
+        not_overdue = self.client.get(BORROWINGS_URL, {"overdue": "false"})
+
+        self.assertEqual(
+            {borrowing["id"] for borrowing in overdue.data["results"]},
+            {self.overdue[0].id, self.overdue[1].id},
+        )
+        self.assertEqual(len(not_overdue.data["results"]), 2)
+        self.assertNotIn(
+            self.overdue[0].id,
+            [borrowing["id"] for borrowing in not_overdue.data["results"]],
+        )
+
+    def test_user_fines_summary_in_one_query(self):
+        self.client.force_authenticate(self.user)
+
+        with self.assertNumQueries(THROTTLE_QUERIES + 1):
+            res = self.client.get(FINES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {
+            "overdue": 2, "overdue_days": 5, "fines": "8.60"
+        })
+
+    def test_fines_summary_without_overdue_borrowings(self):
+        user = get_user_model().objects.create_user(
+            "new@test.com", "testpass"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(FINES_URL)
+
+        self.assertEqual(res.data, {
+            "overdue": 0, "overdue_days": 0, "fines": "0.00"
+        })
+
+    def test_admin_fines_summary_for_user(self):
+        admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        everyone = self.client.get(FINES_URL)
+        other_user = self.client.get(FINES_URL,
+                                     {"user_id": self.other_user.id})
+
+        self.assertEqual(everyone.data["fines"], "29.10")
+        self.assertEqual(other_user.data, {
+            "overdue": 1, "overdue_days": 10, "fines": "20.50"
+        })
+
+    def test_fines_auth_required(self):
+        res = self.client.get(FINES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_process_overdue_command_in_batches(self):
+        out = io.StringIO()
+
+        with self.assertNumQueries(2):
+            call_command("process_overdue", batch_size=2, stdout=out,
+                         stderr=io.StringIO())
+
+        notices = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual([notice["id"] for notice in notices],
+                         [borrowing.id for borrowing in self.overdue])
+        self.assertEqual(notices[2]["user__email"], "other@test.com")
+        self.assertEqual(notices[2]["days_overdue"], 10)
+        self.assertEqual(notices[2]["fine"], "20.50")
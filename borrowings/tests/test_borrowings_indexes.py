@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from datetime import timedelta
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.pagination import BorrowingPagination
+from borrowings.views import BorrowingViewSet
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+USERS = 50
+BORROWINGS_PER_USER = 40
+
+
+class BorrowingIndexUsageTests(TestCase):
+    """Common borrowing list filters must be answered by index scans."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        user_model.objects.bulk_create([
+            user_model(email=f"user{i}@test.com") for i in range(USERS)
+        ])
+        cls.users = list(user_model.objects.order_by("id"))
+        cls.admin = user_model.objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        book = Book.objects.create(
+            title="Sample book",
+            author="Sample author",
+            cover="SOFT",
+            inventory=1,
+            daily_fee=2.05,
+        )
+
+        now = timezone.now()
+        Borrowing.objects.bulk_create([
+            Borrowing(
+                book=book,
+                user=user,
+                expected_return_date=now + timedelta(days=5),
+                # Most loans in a real library have already been returned.
+                actual_return_date=None if i % 10 == 0 else now,
+            )
+            for user in cls.users
+            for i in range(BORROWINGS_PER_USER)
+        ])
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE borrowings_borrowing")
+
+    def list_queryset(self, user, params):
+        request = Request(APIRequestFactory().get(BORROWINGS_URL, params))
+        request.user = user
+
+        view = BorrowingViewSet(request=request, action="list",
+                                format_kwarg=None)
+        return view.get_queryset().order_by(*BorrowingPagination.ordering)
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = queryset.explain()
+
+        if connection.vendor == "postgresql":
+            self.assertIn("Index", plan)
+            self.assertNotIn("Seq Scan on borrowings_borrowing", plan)
+        else:
+            self.assertIn(index_name, plan)
+
+    def test_admin_active_borrowings_of_user(self):
+        queryset = self.list_queryset(
+            self.admin,
+            {"is_active": "true", "user_id": self.users[0].id},
+        )
+
+        self.assert_uses_index(queryset, "borrowing_active_user_idx")
+
+    def test_user_active_borrowings(self):
+        queryset = self.list_queryset(self.users[0], {"is_active": "true"})
+
+        self.assert_uses_index(queryset, "borrowing_active_user_idx")
+
+    def test_admin_returned_borrowings_of_user(self):
+        queryset = self.list_queryset(
+            self.admin,
+            {"is_active": "false", "user_id": self.users[0].id},
+        )
+
+        self.assert_uses_index(queryset, "borrowing_user_return_idx")
+
+    def test_admin_all_borrowings_page(self):
+        queryset = self.list_queryset(self.admin, {})[:20]
+
+        self.assert_uses_index(queryset, "borrowing_borrow_date_idx")
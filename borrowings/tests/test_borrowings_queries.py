@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from datetime import timedelta
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+def detail_url(borrowing_id):
+    return reverse("borrowings:borrowing-detail", args=[borrowing_id])
+
+
+def sample_borrowings(count, user):
+    book = Book.objects.create(
+        title="Sample book",
+        author="Sample author",
+        cover="SOFT",
+        inventory=count,
+        daily_fee=2.05,
+    )
+
+    return Borrowing.objects.bulk_create([
+        Borrowing(
+            book=book,
+            user=user,
+            expected_return_date=timezone.now() + timedelta(days=5),
+        )
+        for _ in range(count)
+    ])
+
+
+# The user rate throttle bucket.
+THROTTLE_QUERIES = 1
+# The page; the conditional GET change marker is in the cache.
+LIST_QUERIES = THROTTLE_QUERIES + 1
+RETRIEVE_QUERIES = THROTTLE_QUERIES + 1
+
+
+class BorrowingsQueryCountTests(TestCase):
+    """The number of queries must not grow with the number of rows."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, params)
+
+        self.assertEqual(res.status_code, 200)
+        return len(context.captured_queries)
+
+    def assert_constant_list_queries(self, user, params=None):
+        self.client.force_authenticate(user)
+        borrowers = [
+            get_user_model().objects.create_user(f"{i}@test.com", "testpass")
+            for i in range(3)
+        ]
+
+        sample_borrowings(1, self.user)
+        few = self.count_queries(BORROWINGS_URL, params)
+
+        for borrower in borrowers:
+            sample_borrowings(10, borrower)
+        sample_borrowings(10, self.user)
+        many = self.count_queries(BORROWINGS_URL, params)
+
+        self.assertEqual(few, many)
+        self.assertEqual(many, LIST_QUERIES)
+
+    def test_admin_list_queries_are_constant(self):
+        self.assert_constant_list_queries(self.admin)
+
+    def test_admin_filtered_list_queries_are_constant(self):
+        self.assert_constant_list_queries(
+            self.admin, {"user_id": self.user.id, "is_active": "true"}
+        )
+
+    def test_user_list_queries_are_constant(self):
+        self.assert_constant_list_queries(self.user)
+
+    def test_list_queries_do_not_depend_on_page_size(self):
+        self.client.force_authenticate(self.admin)
+        sample_borrowings(30, self.user)
+
+        for page_size in (1, 10, 30):
+            self.assertEqual(
+                self.count_queries(BORROWINGS_URL, {"page_size": page_size}),
+                LIST_QUERIES,
+            )
+
+    def test_admin_retrieve_queries(self):
+        borrowing = sample_borrowings(1, self.user)[0]
+        self.client.force_authenticate(self.admin)
+
+        with self.assertNumQueries(RETRIEVE_QUERIES):
+            res = self.client.get(detail_url(borrowing.id))
+
+        self.assertEqual(res.data["user_id"], self.user.id)
+
+    def test_user_retrieve_queries(self):
+        borrowing = sample_borrowings(1, self.user)[0]
+        self.client.force_authenticate(self.user)
+
+        with self.assertNumQueries(RETRIEVE_QUERIES):
+            self.client.get(detail_url(borrowing.id))
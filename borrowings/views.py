@@ -1,17 +1,39 @@
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS
+from django.http import StreamingHttpResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
-from borrowings.models import Borrowing
+from borrowings.cache import get_borrowings_version
+from borrowings.export import (
+    EXPORT_FORMATS,
+    IgnoreClientContentNegotiation,
+    export_rows,
+)
+from borrowings.models import Borrowing, overdue_condition
+from borrowings.pagination import BorrowingPagination
 from borrowings.permissions import IsOwnerOrAdmin
 from borrowings.serializers import (
     BorrowingSerializer,
     BorrowingListSerializer,
     BorrowingDetailsSerializer,
-    CreateBorrowingSerializer)
+    BulkReturnSerializer,
+    CreateBorrowingSerializer,
+    FinesSummarySerializer)
+from library_service.conditional import conditional_response, make_etag
+from library_service.fast_serialization import FastListMixin
+from library_service.replicas import ReplicaReadMixin, replica_alias
 
 
 class BorrowingViewSet(
+    ReplicaReadMixin,
+    FastListMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
@@ -19,24 +41,31 @@ class BorrowingViewSet(
 ):
     queryset = Borrowing.objects.select_related("book")
     permission_classes = [IsOwnerOrAdmin]
+    pagination_class = BorrowingPagination
 
     def get_serializer_class(self):
         if self.action == "list":
             return BorrowingListSerializer
 
-        if self.action == "retrieve":
+        if self.action in ("retrieve", "return_book"):
             return BorrowingDetailsSerializer
 
+        if self.action == "bulk_return":
+            return BulkReturnSerializer
+
         if self.action == "create":
             return CreateBorrowingSerializer
 
+        if self.action == "fines":
+            return FinesSummarySerializer
+
         return BorrowingSerializer
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         if not self.request.user.is_staff:
-            queryset = queryset.filter(user=self.request.user)
+            queryset = queryset.filter(user_id=self.request.user.id)
 
         if self.request.user.is_staff:
             user_id = self.request.query_params.get("user_id")
@@ -51,6 +80,13 @@ class BorrowingViewSet(
                 actual_return_date__isnull=True) if is_active else (
                 queryset.filter(actual_return_date__isnull=False))
 
+        overdue = self.request.query_params.get("overdue")
+
+        if overdue is not None:
+            queryset = queryset.filter(overdue_condition()) if (
+                overdue.lower() in ["true", "yes"]) else (
+                queryset.exclude(overdue_condition()))
+
         return queryset
 
     @extend_schema(
@@ -67,7 +103,117 @@ class BorrowingViewSet(
                 description="Filter by user id, works only for admin users "
                             "(ex. ?user_id=2)",
             ),
+            OpenApiParameter(
+                "overdue",
+                type=OpenApiTypes.BOOL,
+                description="Filter by overdue status (not returned after "
+                            "the expected return date) (ex. ?overdue=true)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        render = partial(super().list, request, *args, **kwargs)
+
+        if "overdue" in request.query_params:
+            # Borrowings turn overdue as time passes, without a write.
+            return render()
+
+        # The cursor is part of the path. No Last-Modified: the versions
+        # are not dates.
+        return conditional_response(
+            request,
+            render,
+            etag=make_etag(
+                "borrowings",
+                request.user.id,
+                request.user.is_staff,
+                request.get_full_path(),
+                request.accepted_renderer.format,
+                *get_borrowings_version(request.user),
+            ),
+        )
+
+    @action(detail=True, methods=["post"], url_path="return")
+    def return_book(self, request, pk=None):
+        borrowing = self.get_object()
+
+        if not Borrowing.objects.filter(pk=borrowing.pk).return_books():
+            raise ValidationError("This borrowing has already been returned.")
+
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-return",
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_return(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        returned = Borrowing.objects.filter(
+            id__in=serializer.validated_data["ids"]
+        ).return_books()
+
+        return Response({"returned": returned})
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "user_id",
+                type=OpenApiTypes.STR,
+                description="Summarize one user's fines, works only for "
+                            "admin users (ex. ?user_id=2)",
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"], url_path="fines")
+    def fines(self, request):
+        summary = self.get_queryset().fines_summary()
+
+        return Response(self.get_serializer(summary).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "export_format",
+                type=OpenApiTypes.STR,
+                enum=tuple(EXPORT_FORMATS),
+                description="Export file format, csv by default "
+                            "(ex. ?export_format=ndjson)",
+            ),
+            OpenApiParameter("is_active", type=OpenApiTypes.STR),
+            OpenApiParameter("user_id", type=OpenApiTypes.STR),
+        ]
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[IsAdminUser],
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def export(self, request):
+        export_format = request.query_params.get("export_format", "csv")
+
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"export_format": f"Choose one of {list(EXPORT_FORMATS)}."}
+            )
+
+        iter_export, content_type = EXPORT_FORMATS[export_format]
+        # The body is streamed after finalize_response() resets the
+        # replica for the request, so route the query explicitly.
+        queryset = self.get_queryset().using(
+            replica_alias.get() or DEFAULT_DB_ALIAS
+        )
+        response = StreamingHttpResponse(
+            iter_export(export_rows(queryset)),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="borrowings.{export_format}"'
+        )
+        return response
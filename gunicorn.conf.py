@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+# Production server settings; the environment overrides the defaults.
+wsgi_app = "library_service.wsgi:application"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY",
+                             multiprocessing.cpu_count() * 2 + 1))
+# Keep DB_POOL_SIZE at least this large, see library_service.postgresql.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then, staggered, to bound memory growth.
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = "-"
+# Import the project once in the master so workers start forked and warm.
+# Database connections are opened lazily, per worker.
+preload_app = True
+
+
+def on_starting(server):
+    # Metrics files of a previous run must not be merged into this one.
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def when_ready(server):
+    # Rendered in the master, after the preload, so every worker forks
+    # with the schema in memory, see library_service.schema.
+    from library_service.schema import warm_schema
+
+    warm_schema()
+
+
+def child_exit(server, worker):
+    # Merge the metrics of a stopped worker into the totals, see
+    # library_service.metrics.
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
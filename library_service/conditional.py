@@ -0,0 +1,37 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(
+        ":".join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def conditional_response(request, render, etag=None, last_modified=None):
+    """Return 304 Not Modified when the client already has the resource.
+
+    ``etag`` and ``last_modified`` should come from a cheap change marker,
+    so ``render`` (serialization and the main query) is skipped entirely
+    for unchanged resources. Mirrors ``django.views.decorators.http``'s
+    ``condition``, which cannot reach the view instance.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+
+    if response is None:
+        response = render()
+
+    if request.method in ("GET", "HEAD"):
+        if timestamp and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(timestamp)
+        if etag:
+            response.headers.setdefault("ETag", etag)
+
+    return response
@@ -0,0 +1,198 @@
+import decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() hands database values back unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+def field_lookup(model, field):
+    """Return the ``values()`` lookup and converter reproducing ``field``,
+    or None when the field needs a model instance."""
+    if isinstance(field, serializers.SlugRelatedField):
+        return f"{field.source}__{field.slug_field}", None
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            return None
+        return field.source, None
+
+    if isinstance(field, (serializers.BaseSerializer,
+                          serializers.RelatedField,
+                          serializers.SerializerMethodField)):
+        return None
+
+    if len(field.source_attrs) != 1:
+        return None
+
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        # Foreign key columns such as ``user_id`` are not looked up by name.
+        attnames = {
+            model_field.attname for model_field in model._meta.concrete_fields
+        }
+        if field.source not in attnames:
+            return None
+    else:
+        if not model_field.concrete or model_field.is_relation:
+            return None
+
+    return field.source, field_converter(field)
+
+
+def datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = getattr(field, "timezone", field.default_timezone())
+
+    if (output_format is None or output_format.lower() != ISO_8601
+            or field_timezone is None):
+        return field.to_representation
+
+    # DateTimeField.to_representation() looks the current timezone up on
+    # every call, which costs more than the formatting itself.
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def decimal_converter(field):
+    coerce_to_string = getattr(field, "coerce_to_string",
+                               api_settings.COERCE_DECIMAL_TO_STRING)
+
+    if (not coerce_to_string or field.localize
+            or field.decimal_places is None):
+        return field.to_representation
+
+    quantum = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return field.to_representation(value)
+
+        return "{:f}".format(
+            value.quantize(quantum, rounding=field.rounding, context=context)
+        )
+
+    return convert
+
+
+def field_converter(field):
+    """Return a function producing the same output as
+    ``field.to_representation()`` for database values, or None when the
+    values can be used as they are."""
+    if type(field) in PASSTHROUGH_FIELDS:
+        return None
+
+    if type(field) is serializers.ChoiceField and all(
+        isinstance(choice, str) for choice in field.choices
+    ):
+        return None
+
+    if type(field) is serializers.DateTimeField:
+        return datetime_converter(field)
+
+    if type(field) is serializers.DecimalField:
+        return decimal_converter(field)
+
+    return field.to_representation
+
+
+class ValuesRepresentation:
+    """Read-only fast path for a model serializer.
+
+    Fetches ``values_list()`` rows for exactly the readable fields and
+    builds plain dicts from them, skipping model instances and DRF's
+    per-field attribute lookups. The rendered JSON is the same as the
+    serializer's: fields keep their order, None stays None, and values
+    go through the field's to_representation() unless it would return
+    them unchanged.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.names = []
+        self.lookups = []
+        self.converters = []
+        self.supported = True
+
+        for field in serializer._readable_fields:
+            lookup = field_lookup(model, field)
+
+            if lookup is None:
+                self.supported = False
+                return
+
+            self.names.append(field.field_name)
+            self.lookups.append(lookup[0])
+            self.converters.append(lookup[1])
+
+    def rows(self, queryset, extra=()):
+        """Named rows for ``queryset``. ``extra`` lookups are fetched after
+        the fields, e.g. the columns a cursor paginator reads its position
+        from."""
+        extra = [lookup for lookup in extra if lookup not in self.lookups]
+        return queryset.values_list(*self.lookups, *extra, named=True)
+
+    def to_representation(self, rows):
+        names = self.names
+        converters = self.converters
+
+        return [
+            {
+                name: value if convert is None or value is None
+                else convert(value)
+                for name, convert, value in zip(names, converters, row)
+            }
+            for row in rows
+        ]
+
+
+class FastListMixin:
+    """Serve list actions through ``ValuesRepresentation`` when the list
+    serializer allows it, falling back to the regular path otherwise."""
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        representation = ValuesRepresentation(self.get_serializer())
+
+        if not self.fast_list or not representation.supported:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = ()
+
+        # Cursor paginators read their position from the ordering fields.
+        get_ordering = getattr(self.paginator, "get_ordering", None)
+        if get_ordering is not None:
+            ordering = [
+                field.lstrip("-")
+                for field in get_ordering(request, queryset, self)
+            ]
+
+        rows = representation.rows(queryset, extra=ordering)
+        page = self.paginate_queryset(rows)
+
+        if page is not None:
+            return self.get_paginated_response(
+                representation.to_representation(page)
+            )
+
+        return Response(representation.to_representation(rows))
@@ -0,0 +1,128 @@
+import functools
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.http import JsonResponse
+
+LIVE_PATH = "/health/live"
+READY_PATH = "/health/ready"
+
+
+def wait_for_database(alias=DEFAULT_DB_ALIAS, timeout=60, delay=0.1,
+                      max_delay=5, on_retry=None):
+    """Open a connection to ``alias``, retrying with exponential backoff
+    until ``timeout`` seconds have passed. Returns the number of attempts;
+    the last error is raised once time is up."""
+    connection = connections[alias]
+    deadline = time.monotonic() + timeout
+    attempts = 0
+
+    while True:
+        attempts += 1
+        try:
+            connection.ensure_connection()
+            return attempts
+        except DatabaseError as exc:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+            if on_retry is not None:
+                on_retry(exc, delay)
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+
+@functools.lru_cache
+def known_migrations():
+    """Migrations on disk and what they replace, read once per process."""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return {
+        key: frozenset(loader.disk_migrations[key].replaces)
+        for key in loader.graph.nodes
+    }
+
+
+def unapplied_migrations(alias=DEFAULT_DB_ALIAS):
+    """Return the migrations on disk that ``alias`` has not applied. Costs
+    two small queries, the migration files are only read once."""
+    recorder = MigrationRecorder(connections[alias])
+    applied = set()
+    if recorder.has_table():
+        applied = set(recorder.migration_qs.values_list("app", "name"))
+
+    return sorted(
+        key
+        for key, replaces in known_migrations().items()
+        if key not in applied and not (replaces and replaces <= applied)
+    )
+
+
+def readiness(alias=DEFAULT_DB_ALIAS):
+    """Return the problems keeping the service from taking traffic."""
+    try:
+        connections[alias].ensure_connection()
+        pending = unapplied_migrations(alias)
+    except DatabaseError as exc:
+        # Connection errors name hosts, keep them out of the response.
+        return [f"database unavailable ({type(exc).__name__})"]
+
+    if pending:
+        return [
+            "unapplied migrations: "
+            + ", ".join(f"{app}.{name}" for app, name in pending)
+        ]
+
+    return []
+
+
+def ready_response(problems):
+    if problems:
+        return JsonResponse({"status": "unavailable", "problems": problems},
+                            status=503)
+    return JsonResponse({"status": "ok"})
+
+
+class HealthCheckMiddleware:
+    """Answer liveness and readiness probes before the rest of the stack.
+
+    ``/health/live`` only says the process serves requests.
+    ``/health/ready`` opens a database connection and checks migrations
+    and returns 503 until both are fine. Probes skip host validation,
+    sessions and authentication, since orchestrators call them by IP.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if request.path == LIVE_PATH:
+            return JsonResponse({"status": "ok"})
+
+        if request.path == READY_PATH:
+            return ready_response(readiness())
+
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.path == LIVE_PATH:
+            return JsonResponse({"status": "ok"})
+
+        if request.path == READY_PATH:
+            return ready_response(await sync_to_async(readiness)())
+
+        return await self.get_response(request)
@@ -0,0 +1,175 @@
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from library_service.query_wrappers import query_wrapper
+
+# Requests that did not resolve to a route share one label, so random
+# paths cannot blow up the number of series.
+UNRESOLVED = "<unresolved>"
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests by route name, method and status code.",
+    ["view", "method", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent producing the response.",
+    ["view", "method"],
+    buckets=(.005, .01, .025, .05, .075, .1, .25, .5, .75, 1, 2.5, 5, 10),
+)
+QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run per request.",
+    ["view", "method"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per request.",
+    ["view", "method"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size.",
+    ["view", "method"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name
+
+
+def counted_content(content, observe):
+    size = 0
+    try:
+        for chunk in content:
+            size += len(chunk)
+            yield chunk
+    finally:
+        observe(size)
+
+
+class MetricsMiddleware:
+    """Record per-route request count, latency, database queries and time,
+    and response size.
+
+    Routes are labelled with their resolved URL name, e.g.
+    ``borrowings:borrowing-list``. Values are aggregated in process by
+    prometheus_client; with ``PROMETHEUS_MULTIPROC_DIR`` set they go to
+    per-worker files that ``metrics_view`` merges, so gunicorn workers
+    report together. Database figures cover the view up to returning the
+    response, not the iteration of streaming responses. Runs natively
+    under ASGI, see ``library_service.query_wrappers``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timer = QueryTimer()
+        started = time.perf_counter()
+
+        with query_wrapper(timer):
+            response = self.get_response(request)
+
+        return self.record(request, response, timer, started)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+
+        with query_wrapper(timer):
+            response = await self.get_response(request)
+
+        return self.record(request, response, timer, started)
+
+    def record(self, request, response, timer, started):
+        duration = time.perf_counter() - started
+        labels = (view_name(request), request.method)
+
+        REQUESTS.labels(*labels, str(response.status_code)).inc()
+        LATENCY.labels(*labels).observe(duration)
+        QUERIES.labels(*labels).observe(timer.count)
+        DB_TIME.labels(*labels).observe(timer.duration)
+
+        size = RESPONSE_SIZE.labels(*labels)
+        if response.streaming:
+            response.streaming_content = counted_content(
+                response.streaming_content, size.observe
+            )
+        else:
+            size.observe(len(response.content))
+
+        return response
+
+
+def may_read_metrics(request):
+    """Staff users, and scrapers sending ``METRICS_TOKEN`` as a bearer
+    token."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+
+    token = settings.METRICS_TOKEN
+    scheme, _, credentials = request.headers.get(
+        "Authorization", ""
+    ).partition(" ")
+    return bool(token) and scheme.lower() == "bearer" and (
+        hmac.compare_digest(credentials.encode(), token.encode())
+    )
+
+
+def metrics_view(request):
+    """Expose the metrics in the Prometheus text format."""
+    if not may_read_metrics(request):
+        return HttpResponseForbidden()
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry),
+                        content_type=CONTENT_TYPE_LATEST)
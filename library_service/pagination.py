@@ -0,0 +1,182 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination positioned on every ordering field.
+
+    DRF's ``CursorPagination`` only remembers the first ordering field and
+    skips rows sharing its value with an offset, which is capped at
+    ``offset_cutoff``; paging through more ties than that never ends. Here
+    the position holds all the ordering fields, whose last one has to be
+    unique (e.g. ``("-total_loans", "-id")``), so pages never overlap and
+    the offset stays 0. Index the ordering fields together so each page
+    is an index range scan. Rows with NULL in a nullable ordering field
+    come last in either direction.
+    """
+
+    def get_position_values(self, instance, ordering):
+        values = []
+
+        for order in ordering:
+            field_name = order.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = getattr(instance, field_name)
+            values.append(None if value is None else str(value))
+
+        return values
+
+    def _get_position_from_instance(self, instance, ordering):
+        return json.dumps(self.get_position_values(instance, ordering),
+                          separators=(",", ":"))
+
+    def get_ordering_field(self, queryset, field_name):
+        annotation = queryset.query.annotations.get(field_name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(field_name)
+
+    def decode_position(self, position, queryset):
+        """Values of ``position`` as their ordering fields' types; a
+        tampered position is an invalid cursor, as in ``decode_cursor``.
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        decoded = []
+
+        for order, value in zip(self.ordering, values):
+            field = self.get_ordering_field(queryset, order.lstrip("-"))
+            if value is None and field.null:
+                decoded.append(None)
+                continue
+            if not isinstance(value, str):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                decoded.append(field.to_python(value))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+
+        return decoded
+
+    def get_order_by(self, queryset, reverse):
+        """``self.ordering`` as expressions placing NULLs last, first when
+        paging backwards."""
+        order_by = []
+
+        for order in self.ordering:
+            field_name = order.lstrip("-")
+            descending = order.startswith("-") != reverse
+            if self.get_ordering_field(queryset, field_name).null:
+                nulls = {"nulls_first": True} if reverse else {
+                    "nulls_last": True
+                }
+            else:
+                nulls = {}
+            if descending:
+                order_by.append(F(field_name).desc(**nulls))
+            else:
+                order_by.append(F(field_name).asc(**nulls))
+
+        return order_by
+
+    def position_filter(self, values, reverse, queryset):
+        """Rows after the position ``values`` in the (possibly reversed)
+        ordering."""
+        condition = Q()
+        equal = Q()
+
+        for order, value in zip(self.ordering, values):
+            field_name = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+
+            if value is None:
+                # NULLs come last, only non-NULLs follow them backwards.
+                if reverse:
+                    condition |= equal & Q(**{f"{field_name}__isnull": False})
+                equal &= Q(**{f"{field_name}__isnull": True})
+                continue
+
+            after = Q(**{f"{field_name}__{lookup}": value})
+            if not reverse and self.get_ordering_field(
+                    queryset, field_name).null:
+                after |= Q(**{f"{field_name}__isnull": True})
+            condition |= equal & after
+            equal &= Q(**{field_name: value})
+
+        first = self.ordering[0]
+        if self.get_ordering_field(queryset, first.lstrip("-")).null:
+            return condition
+
+        # Redundant, but lets the database start the scan at the position.
+        lookup = "lte" if first.startswith("-") != reverse else "gte"
+
+        return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if current_position is not None:
+            queryset = queryset.filter(self.position_filter(
+                self.decode_position(current_position, queryset), reverse,
+                queryset,
+            ))
+
+        queryset = queryset.order_by(*self.get_order_by(queryset, reverse))
+
+        # From here on as in CursorPagination.
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
@@ -0,0 +1,88 @@
+import os
+import threading
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+
+from library_service.postgresql.pool import ConnectionPool
+
+POOL_DEFAULTS = {
+    # Connections per process; 0 opens and closes them like Django does.
+    "SIZE": 0,
+    "TIMEOUT": 10,
+    "MAX_AGE": 1800,
+    "CHECK_AFTER": 5,
+}
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the database from being
+        # dropped.
+        DatabaseWrapper.close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a per-process
+    ``ConnectionPool`` instead of opening one per request.
+
+    Configured with a ``POOL`` dict next to the usual keys of a
+    ``DATABASES`` entry, see ``POOL_DEFAULTS``. With ``CONN_MAX_AGE = 0``
+    Django closes the connection when a request finishes, which hands it
+    back to the pool, so ``SIZE`` bounds the connections of a worker
+    whatever its thread count.
+    """
+    creation_class = DatabaseCreation
+
+    pools = {}
+    pools_lock = threading.Lock()
+
+    def pool_settings(self):
+        return {**POOL_DEFAULTS, **self.settings_dict.get("POOL", {})}
+
+    def get_pool(self, conn_params):
+        key = (self.alias, repr(sorted(conn_params.items())))
+
+        with self.pools_lock:
+            pool = self.pools.get(key)
+            # A forked worker must not share its parent's sockets.
+            if pool is None or pool.pid != os.getpid():
+                pool_settings = self.pool_settings()
+                pool = self.pools[key] = ConnectionPool(
+                    partial(super().get_new_connection, conn_params),
+                    size=pool_settings["SIZE"],
+                    timeout=pool_settings["TIMEOUT"],
+                    max_age=pool_settings["MAX_AGE"],
+                    check_after=pool_settings["CHECK_AFTER"],
+                )
+
+        return pool
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_settings()["SIZE"]:
+            return super().get_new_connection(conn_params)
+
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.acquire()
+        # Set by the parent class when it opens a connection.
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        pool = getattr(self, "pool", None)
+        if pool is None or self.connection is None:
+            return super()._close()
+
+        self.pool = None
+        with self.wrap_database_errors:
+            pool.release(self.connection)
+
+    @classmethod
+    def close_pools(cls):
+        with cls.pools_lock:
+            pools = list(cls.pools.values())
+        for pool in pools:
+            pool.close()
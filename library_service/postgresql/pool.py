@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """A bounded set of open psycopg2 connections shared by the threads of
+    one process.
+
+    At most ``size`` connections exist at a time; ``acquire()`` waits up
+    to ``timeout`` seconds for one to be released. Released connections
+    are rolled back and kept open for the next ``acquire()``, which hands
+    out the most recently used one. A connection that sat idle for more
+    than ``check_after`` seconds is checked with ``SELECT 1`` first, and
+    connections older than ``max_age`` seconds are replaced.
+    """
+
+    def __init__(self, connect, size, timeout=10, max_age=1800,
+                 check_after=5):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.check_after = check_after
+        self.pid = os.getpid()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        # (connection, opened at, released at), most recently released last.
+        self.idle = deque()
+        self.opened_at = {}
+
+    def acquire(self):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                f"No database connection was released within "
+                f"{self.timeout} seconds, all {self.size} are in use."
+            )
+
+        try:
+            while True:
+                with self.lock:
+                    entry = self.idle.pop() if self.idle else None
+
+                if entry is None:
+                    connection = self.connect()
+                    self.opened_at[connection] = time.monotonic()
+                    return connection
+
+                connection, opened_at, released_at = entry
+                now = time.monotonic()
+                if now - opened_at >= self.max_age:
+                    self.discard(connection)
+                elif (now - released_at >= self.check_after
+                      and not self.is_usable(connection)):
+                    self.discard(connection)
+                else:
+                    return connection
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection):
+        try:
+            if self.reset(connection):
+                with self.lock:
+                    self.idle.append((connection,
+                                      self.opened_at[connection],
+                                      time.monotonic()))
+            else:
+                self.discard(connection)
+        finally:
+            self.slots.release()
+
+    def reset(self, connection):
+        """Roll back whatever the connection was doing, return whether it
+        can be reused."""
+        if connection.closed:
+            return False
+
+        try:
+            if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+
+        return connection.info.transaction_status == TRANSACTION_STATUS_IDLE
+
+    def is_usable(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def discard(self, connection):
+        self.opened_at.pop(connection, None)
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def close(self):
+        """Close the idle connections."""
+        with self.lock:
+            idle, self.idle = self.idle, deque()
+
+        for connection, _, _ in idle:
+            self.discard(connection)
@@ -0,0 +1,53 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Wrappers of the current request, outermost first.
+active_wrappers = ContextVar("active_wrappers", default=())
+
+
+def dispatch(execute, sql, params, many, context):
+    for wrapper in reversed(active_wrappers.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    # First, so a connection.execute_wrapper() block popping its own
+    # wrapper off the end cannot remove it.
+    if dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, dispatch)
+
+
+def install_all(**kwargs):
+    """Install the dispatcher on the calling thread's connections."""
+    for connection in connections.all():
+        install(connection)
+
+
+# New connections, and at the start of every request the connections of
+# the thread its sync code runs in (the ASGI handler sends the signal
+# there too), e.g. persistent ones opened before this module was loaded.
+connection_created.connect(install, dispatch_uid="query_wrappers")
+request_started.connect(install_all, dispatch_uid="query_wrappers")
+
+
+@contextmanager
+def query_wrapper(wrapper):
+    """Like ``connection.execute_wrapper(wrapper)`` for every connection,
+    but scoped to the current context instead of the current thread.
+
+    Under ASGI a request's queries run in worker threads through
+    ``sync_to_async``, which copies the context, so async middleware can
+    wrap them from the event loop.
+    """
+    install_all()
+    token = active_wrappers.set((*active_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        active_wrappers.reset(token)
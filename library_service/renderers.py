@@ -0,0 +1,52 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+ORJSON_OPTIONS = (
+    # Datetimes and dataclasses go through DRF's encoder, as they do now.
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None else 0
+)
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer encoding with orjson when it is installed.
+
+    The output is byte for byte what ``JSONRenderer`` produces with the
+    default compact, unicode and strict settings: anything orjson does
+    not handle natively (Decimal, datetime, lazy strings, ...) goes
+    through DRF's encoder, and whatever orjson rejects (non-string keys,
+    integers beyond 64 bits) is rendered by ``JSONRenderer`` instead, so
+    it fails or succeeds the same way. Indented output and other settings
+    always use ``JSONRenderer``.
+
+    The exceptions are floats: orjson writes ``1e16`` and ``0.00001``
+    where the stdlib writes ``1e+16`` and ``1e-05``, and it writes NaN
+    and infinity as ``null`` instead of refusing to render them.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default,
+                               option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        # Same escaping as JSONRenderer, keeps the output a JavaScript
+        # subset.
+        return ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+            PARAGRAPH_SEPARATOR, b"\\u2029"
+        )
@@ -0,0 +1,140 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+# Replica the current request reads from, None for the primary.
+replica_alias = ContextVar("replica_alias", default=None)
+
+
+def pin_key(user_id):
+    return f"replicas:pin:{user_id}"
+
+
+def pin_to_primary(user):
+    """Send the user's reads to the primary until replicas caught up."""
+    cache.set(pin_key(user.pk), True, settings.REPLICA_MAX_LAG)
+
+
+def is_pinned(user):
+    return user.is_authenticated and bool(cache.get(pin_key(user.pk)))
+
+
+def cache_timeout():
+    """Timeout for caching what the current request read.
+
+    A replica may lag behind the primary, so results read from one are
+    only kept for ``REPLICA_MAX_LAG`` seconds, e.g. when the catalog
+    version was bumped before the replica saw the change.
+    """
+    if replica_alias.get() is None:
+        return DEFAULT_TIMEOUT
+    return settings.REPLICA_MAX_LAG
+
+
+def cache_source():
+    """Cache namespace for what the current request read.
+
+    A replica may not have a write the primary already committed, e.g. a
+    checkout that bumped the catalog version, so results read from one are
+    cached apart from those read from the primary, which is all that users
+    pinned after writing get to see.
+    """
+    if replica_alias.get() is None:
+        return "primary"
+    return "replica"
+
+
+class ReplicaRouter:
+    """Read from the replica chosen for the current request, see
+    ``ReplicaReadMixin``, and write everything to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return replica_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, instances read from a replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Run the queries of safe requests on a random replica, unless the
+    user is pinned to the primary after writing."""
+    replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if (request.method in SAFE_METHODS and settings.DATABASE_REPLICAS
+                and not is_pinned(request.user)):
+            self.replica_token = replica_alias.set(
+                random.choice(settings.DATABASE_REPLICAS)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self.replica_token is not None:
+            replica_alias.reset(self.replica_token)
+            self.replica_token = None
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaPinMiddleware:
+    """Pin users to the primary for ``REPLICA_MAX_LAG`` seconds after a
+    successful write request, e.g. a checkout or a profile update, so
+    they read their own writes."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            # Reading a lazy request.user may query the session.
+            await sync_to_async(self.pin)(request, response)
+
+        return response
+
+    @staticmethod
+    def pin(request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # DRF hands the user it authenticated to the Django request.
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user)
@@ -0,0 +1,106 @@
+import functools
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils import translation
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.utils.text import compress_string
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from library_service.conditional import conditional_response
+
+
+@functools.lru_cache
+def generate_schema(lang=None):
+    """Introspect every view and serializer once per process and language.
+
+    The schema only changes with the code, so a deploy, which restarts the
+    processes, is what invalidates it. Generated without a request, like
+    ``manage.py spectacular``, so every client gets the same document.
+    """
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    if lang is None:
+        return generator.get_schema(request=None, public=True)
+    with translation.override(lang):
+        return generator.get_schema(request=None, public=True)
+
+
+@functools.lru_cache
+def get_document(renderer_class, lang=None):
+    """Render the schema with ``renderer_class`` and keep the bytes, a
+    gzipped copy and their ETag."""
+    renderer = renderer_class()
+    content = renderer.render(generate_schema(lang), renderer.media_type, {})
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f"{content_type}; charset={renderer.charset}"
+
+    return {
+        "content": content,
+        "compressed": compress_string(content),
+        "content_type": content_type,
+        "etag": quote_etag(hashlib.md5(content).hexdigest()),
+        "filename": f"{spectacular_settings.TITLE or 'schema'}"
+                    f".{renderer.format}",
+    }
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """Serve the OpenAPI schema as a static document.
+
+    Rendered once per format and language, then answered from memory with
+    an ETag, so clients revalidate with a 304, and gzipped when accepted.
+    Requests for a specific API version fall back to generating it.
+    """
+    # A static document costs less to serve than the two bucket upserts,
+    # and loading the docs should not eat into the API quota.
+    throttle_classes = []
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        lang = request.GET.get("lang") if settings.USE_I18N else None
+        if "version" in request.GET or (
+                lang and lang not in dict(settings.LANGUAGES)):
+            return super().get(request, *args, **kwargs)
+
+        document = get_document(type(request.accepted_renderer), lang or None)
+
+        compressed = re_accepts_gzip.search(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        etag = document["etag"]
+        if compressed:
+            # As GZipMiddleware does, the bytes differ from the plain ones.
+            etag = f"W/{etag}"
+
+        def render():
+            response = HttpResponse(
+                document["compressed" if compressed else "content"],
+                content_type=document["content_type"],
+            )
+            if compressed:
+                response.headers["Content-Encoding"] = "gzip"
+            response.headers["Content-Disposition"] = (
+                f'inline; filename="{document["filename"]}"'
+            )
+            return response
+
+        response = conditional_response(request, render, etag=etag)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        # Stored by clients and proxies but revalidated, so a deploy shows
+        # up on the next request.
+        patch_cache_control(response, public=True, no_cache=True)
+
+        return response
+
+
+def warm_schema():
+    """Render the default documents, e.g. in the gunicorn master so the
+    workers fork with them."""
+    for renderer_class in CachedSchemaView.renderer_classes:
+        get_document(renderer_class)
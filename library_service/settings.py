@@ -25,10 +25,18 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = (os.environ["SECRET_KEY"])
 
+# DJANGO_ENV=production selects the production profile: debug off, hosts
+# from ALLOWED_HOSTS and pooled database connections.
+PRODUCTION = os.environ.get("DJANGO_ENV", "development") == "production"
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get(
+    "DEBUG", "false" if PRODUCTION else "true"
+).lower() in ("1", "true", "yes")
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
 
 
 # Application definition
@@ -45,14 +53,23 @@ INSTALLED_APPS = [
     "user",
     "books",
     "borrowings",
+    "throttling",
+    "analytics",
+    "profiling",
 ]
 
 MIDDLEWARE = [
+    # Probes are answered before anything else, see library_service.health.
+    "library_service.health.HealthCheckMiddleware",
+    # Next, so it times the whole stack, see library_service.metrics.
+    "library_service.metrics.MetricsMiddleware",
+    "profiling.middleware.SQLProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "library_service.replicas.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -83,13 +100,81 @@ WSGI_APPLICATION = "library_service.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # PostgreSQL with a per-process connection pool, see
+        # library_service.postgresql.
+        "ENGINE": "library_service.postgresql",
         "NAME": os.environ["POSTGRES_DB"],
         "USER": os.environ["POSTGRES_USER"],
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # With the pool, 0 returns the connection to it after each request.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 0)),
+        "POOL": {
+            # Connections per worker process, 0 disables the pool.
+            "SIZE": int(os.environ.get("DB_POOL_SIZE",
+                                       4 if PRODUCTION else 0)),
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        },
+    }
+}
+
+# Read replicas ("host" or "host:port", comma separated) serving the safe
+# requests of the book and borrowing endpoints, see library_service.replicas.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")), 1
+):
+    host, _, port = replica.partition(":")
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
     }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["library_service.replicas.ReplicaRouter"]
+
+# Seconds replicas may lag behind: users stay on the primary this long
+# after writing, and responses read from a replica are cached this long.
+REPLICA_MAX_LAG = int(os.environ.get("REPLICA_MAX_LAG", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# Gunicorn runs several worker processes in production, so both caches
+# default to a backend they share there: catalog invalidation, evicted
+# users and replica pins have to reach every worker. Use a DatabaseCache
+# (and run createcachetable) when several containers serve the API.
+SHARED_CACHE_BACKEND = "django.core.cache.backends.filebased.FileBasedCache"
+LOCAL_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+CACHE_DIR = os.environ.get("CACHE_DIR", "/tmp/library_service_cache")
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            SHARED_CACHE_BACKEND if PRODUCTION else LOCAL_CACHE_BACKEND,
+        ),
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION",
+            os.path.join(CACHE_DIR, "default") if PRODUCTION else "",
+        ),
+    },
+    # Rendered book catalog responses, see books.cache.
+    "catalog": {
+        "BACKEND": os.environ.get(
+            "CATALOG_CACHE_BACKEND",
+            SHARED_CACHE_BACKEND if PRODUCTION else LOCAL_CACHE_BACKEND,
+        ),
+        "LOCATION": os.environ.get(
+            "CATALOG_CACHE_LOCATION",
+            os.path.join(CACHE_DIR, "catalog") if PRODUCTION else "catalog",
+        ),
+        "TIMEOUT": None,
+    },
 }
 
 # Password validation
@@ -128,6 +213,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.0/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
@@ -137,13 +223,26 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "throttling.throttles.AnonTokenBucketThrottle",
+        "throttling.throttles.UserTokenBucketThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "300/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.environ.get("THROTTLE_ANON_RATE", "100/day"),
+        "user": os.environ.get("THROTTLE_USER_RATE", "300/day"),
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ),
+    # Encode and decode with orjson when it is installed, same output.
+    "DEFAULT_RENDERER_CLASSES": [
+        "library_service.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "library_service.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
@@ -159,6 +258,18 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Bearer token Prometheus sends to read /metrics, which is otherwise only
+# open to staff users, see library_service.metrics.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Share of requests whose SQL is profiled (0 disables profiling) and the
+# duration from which a query is logged with its plan, see profiling.
+SQL_PROFILE_SAMPLE_RATE = float(os.environ.get("SQL_PROFILE_SAMPLE_RATE", 0))
+SQL_SLOW_QUERY_MS = float(os.environ.get("SQL_SLOW_QUERY_MS", 200))
+
+# Seconds an authenticated user stays cached, see user.authentication.
+AUTH_USER_CACHE_TIMEOUT = 60
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
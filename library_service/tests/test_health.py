@@ -0,0 +1,153 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+
+from library_service import health
+
+PENDING = [("books", "0099_future")]
+
+
+def unavailable():
+    return OperationalError('could not connect to server at "db"')
+
+
+@override_settings(ALLOWED_HOSTS=["api.example.com"])
+class HealthEndpointTests(TestCase):
+    def test_live_needs_no_database(self):
+        with self.assertNumQueries(0):
+            res = self.client.get("/health/live", HTTP_HOST="10.0.0.7")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    def test_ready_when_migrated(self):
+        # The migration files are read once, the database is asked every
+        # time.
+        self.client.get("/health/ready")
+
+        with self.assertNumQueries(2):
+            res = self.client.get("/health/ready", HTTP_HOST="10.0.0.7")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    async def test_ready_under_asgi(self):
+        res = await self.async_client.get("/health/ready")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    def test_not_ready_with_unapplied_migrations(self):
+        known = {**health.known_migrations(), PENDING[0]: frozenset()}
+
+        with mock.patch.object(health, "known_migrations",
+                               return_value=known):
+            res = self.client.get("/health/ready")
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.json()["problems"],
+                         ["unapplied migrations: books.0099_future"])
+
+    def test_not_ready_without_database(self):
+        with mock.patch.object(connection, "ensure_connection",
+                               side_effect=unavailable()):
+            res = self.client.get("/health/ready")
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.json()["problems"],
+                         ["database unavailable (OperationalError)"])
+
+
+class UnappliedMigrationsTests(TestCase):
+    def test_squashed_migration_counts_as_applied(self):
+        known = {
+            ("books", "0001_squashed_0005"): frozenset(
+                {("books", "0001_initial"), ("books", "0002_book_cover")}
+            ),
+        }
+        applied = {("books", "0001_initial"), ("books", "0002_book_cover")}
+
+        recorder = mock.Mock()
+        recorder.return_value.migration_qs.values_list.return_value = applied
+
+        with mock.patch.object(health, "known_migrations",
+                               return_value=known), \
+                mock.patch.object(health, "MigrationRecorder", recorder):
+            self.assertEqual(health.unapplied_migrations(), [])
+
+
+class WaitForDatabaseTests(TestCase):
+    def test_retries_with_exponential_backoff(self):
+        with mock.patch.object(
+            connection, "ensure_connection",
+            side_effect=[unavailable(), unavailable(), unavailable(), None],
+        ), mock.patch.object(health.time, "sleep") as sleep:
+            attempts = health.wait_for_database(delay=0.5)
+
+        self.assertEqual(attempts, 4)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list],
+                         [0.5, 1, 2])
+
+    def test_gives_up_after_timeout(self):
+        with mock.patch.object(connection, "ensure_connection",
+                               side_effect=unavailable()):
+            with self.assertRaises(OperationalError):
+                health.wait_for_database(timeout=0.05, delay=0.01)
+
+
+class WaitForDbCommandTests(TestCase):
+    def wait_for_db(self, *args):
+        out = StringIO()
+        call_command("wait_for_db", *args, stdout=out)
+        return out.getvalue()
+
+    def test_waits_for_a_connection(self):
+        with mock.patch.object(
+            connection, "ensure_connection",
+            side_effect=[unavailable(), None],
+        ), mock.patch.object(health.time, "sleep"):
+            output = self.wait_for_db()
+
+        self.assertIn("Database unavailable, retrying in 0.1s", output)
+        self.assertIn("Database available after 2 attempt(s).", output)
+
+    def test_fails_when_the_database_stays_down(self):
+        with mock.patch.object(connection, "ensure_connection",
+                               side_effect=unavailable()):
+            with self.assertRaisesMessage(CommandError,
+                                          "Database unavailable after"):
+                self.wait_for_db("--timeout", "0")
+
+    def test_migrate_is_skipped_when_up_to_date(self):
+        with mock.patch(
+            "books.management.commands.wait_for_db.call_command"
+        ) as migrate:
+            output = self.wait_for_db("--migrate")
+
+        self.assertIn("No unapplied migrations.", output)
+        migrate.assert_not_called()
+
+    def test_migrate_runs_when_needed(self):
+        with mock.patch(
+            "books.management.commands.wait_for_db.unapplied_migrations",
+            return_value=PENDING,
+        ), mock.patch(
+            "books.management.commands.wait_for_db.call_command"
+        ) as migrate:
+            self.wait_for_db("--migrate")
+
+        migrate.assert_called_once_with("migrate", database="default",
+                                        interactive=False, verbosity=1)
+
+    def test_check_migrations(self):
+        with mock.patch(
+            "books.management.commands.wait_for_db.unapplied_migrations",
+            return_value=PENDING,
+        ):
+            with self.assertRaisesMessage(CommandError,
+                                          "books.0099_future"):
+                self.wait_for_db("--check-migrations")
@@ -0,0 +1,102 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from library_service.parsers import FastJSONParser
+from library_service.renderers import FastJSONRenderer
+
+PAYLOADS = [
+    {
+        "id": 1,
+        "title": "Émile, ou De l’éducation",
+        "cover": "SOFT",
+        "daily_fee": "2.05",
+        "last_borrowed_at": "2024-03-04T12:00:00Z",
+        "tags": ["a", "b"],
+    },
+    {"next": None, "previous": None, "results": []},
+    {"fee": Decimal("2.05"), "rate": 1234.5, "ratio": 0.1, "ok": True},
+    [
+        datetime(2024, 3, 4, 12, tzinfo=timezone.utc),
+        datetime(2024, 3, 4, 12, 0, 0, 1500, tzinfo=timezone.utc),
+        datetime(2024, 1, 4, 12, tzinfo=ZoneInfo("Europe/London")),
+        datetime(2024, 3, 4, 12, tzinfo=ZoneInfo("Europe/Kyiv")),
+        datetime(2024, 3, 4, 12),
+        date(2024, 3, 4),
+        time(12, 30),
+        timedelta(days=1, seconds=5),
+    ],
+    {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "lazy": gettext_lazy("This field is required."),
+        "detail": [ErrorDetail("Invalid.", code="invalid")],
+        "set": {1},
+        "tuple": (1, 2),
+    },
+    {"separators": "line\u2028paragraph\u2029", "quote": "\"\\\n\t"},
+    {1: "non-string key"},
+    {"big": 2 ** 70, "negative": -2 ** 70},
+    "plain string",
+    [],
+]
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_same_output_as_json_renderer(self):
+        for payload in PAYLOADS:
+            self.assertEqual(FastJSONRenderer().render(payload),
+                             JSONRenderer().render(payload))
+
+    def test_indented_output(self):
+        media_type = "application/json; indent=4"
+
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOADS[0], media_type),
+            JSONRenderer().render(PAYLOADS[0], media_type),
+        )
+
+    def test_none(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_unserializable(self):
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"value": object()})
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body))
+
+    def test_same_result_as_json_parser(self):
+        for body in (
+            b'{"ids": [1, 2, 3], "upsert": true}',
+            b'{"title": "\\u00c9mile", "fee": 2.05, "none": null}',
+            b'{"big": 123456789012345678901234567890}',
+            b'[18446744073709551615, -9223372036854775809]',
+            "[\"Émile\"]".encode(),
+        ):
+            self.assertEqual(self.parse(FastJSONParser(), body),
+                             self.parse(JSONParser(), body))
+
+    def test_big_integers_stay_integers(self):
+        data = self.parse(FastJSONParser(),
+                          b'{"big": 123456789012345678901234567890}')
+
+        self.assertEqual(data["big"], 123456789012345678901234567890)
+
+    def test_same_errors_as_json_parser(self):
+        for body in (b"", b'{"ids": [1,', b"NaN", b"\xff"):
+            with self.assertRaises(ParseError) as fast:
+                self.parse(FastJSONParser(), body)
+            with self.assertRaises(ParseError) as regular:
+                self.parse(JSONParser(), body)
+
+            self.assertEqual(str(fast.exception), str(regular.exception))
@@ -0,0 +1,189 @@
+import os
+import tempfile
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY, Counter, values
+
+from books.models import Book
+from library_service import metrics
+
+BOOKS_URL = reverse("books:book-list")
+METRICS_URL = reverse("metrics")
+
+
+def sample(name, view, method="GET", **labels):
+    return REGISTRY.get_sample_value(
+        name, {"view": view, "method": method, **labels}
+    ) or 0
+
+
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        Book.objects.create(title="Dune", author="Frank Herbert",
+                            cover="HARD", inventory=3, daily_fee=1)
+
+    def test_request_is_recorded_under_its_route_name(self):
+        requests = sample("http_requests_total", "books:book-list",
+                          status="200")
+        observed = sample("http_request_duration_seconds_count",
+                          "books:book-list")
+        size = sample("http_response_size_bytes_sum", "books:book-list")
+
+        res = self.client.get(BOOKS_URL)
+
+        self.assertEqual(
+            sample("http_requests_total", "books:book-list", status="200"),
+            requests + 1,
+        )
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", "books:book-list"),
+            observed + 1,
+        )
+        self.assertEqual(
+            sample("http_response_size_bytes_sum", "books:book-list"),
+            size + len(res.content),
+        )
+
+    def test_database_queries_are_counted(self):
+        queries = sample("http_request_db_queries_sum", "books:book-list")
+        db_time = sample("http_request_db_duration_seconds_sum",
+                         "books:book-list")
+
+        with self.assertNumQueries(3) as context:
+            self.client.get(BOOKS_URL + "?search=dune")
+
+        self.assertEqual(
+            sample("http_request_db_queries_sum", "books:book-list"),
+            queries + len(context.captured_queries),
+        )
+        self.assertGreater(
+            sample("http_request_db_duration_seconds_sum",
+                   "books:book-list"),
+            db_time,
+        )
+
+    def test_unknown_paths_share_one_label(self):
+        before = sample("http_requests_total", metrics.UNRESOLVED,
+                        status="404")
+
+        self.client.get("/no-such-page/1/")
+        self.client.get("/no-such-page/2/")
+
+        self.assertEqual(
+            sample("http_requests_total", metrics.UNRESOLVED, status="404"),
+            before + 2,
+        )
+
+    def test_streaming_response_size_is_recorded_once_consumed(self):
+        def stream(request):
+            return StreamingHttpResponse(iter([b"ab", b"cde"]))
+
+        middleware = metrics.MetricsMiddleware(stream)
+        request = mock.Mock(method="GET", resolver_match=None)
+        before = sample("http_response_size_bytes_sum", metrics.UNRESOLVED)
+
+        response = middleware(request)
+        self.assertEqual(
+            sample("http_response_size_bytes_sum", metrics.UNRESOLVED),
+            before,
+        )
+
+        self.assertEqual(b"".join(response.streaming_content), b"abcde")
+        self.assertEqual(
+            sample("http_response_size_bytes_sum", metrics.UNRESOLVED),
+            before + 5,
+        )
+
+    async def test_async_requests_are_recorded(self):
+        requests = sample("http_requests_total", "books:book-list",
+                          status="200")
+        queries = sample("http_request_db_queries_sum", "books:book-list")
+
+        res = await self.async_client.get(BOOKS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            sample("http_requests_total", "books:book-list", status="200"),
+            requests + 1,
+        )
+        # Run in a worker thread, still counted.
+        self.assertGreater(
+            sample("http_request_db_queries_sum", "books:book-list"),
+            queries,
+        )
+
+    async def test_middleware_stays_async_under_asgi(self):
+        async def view(request):
+            return HttpResponse("ok")
+
+        middleware = metrics.MetricsMiddleware(view)
+        request = mock.Mock(method="GET", resolver_match=None)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(request)
+        self.assertEqual(response.content, b"ok")
+
+
+class MetricsViewTests(TestCase):
+    def setUp(self):
+        self.staff = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_login(self.staff)
+
+    def test_metrics_are_exposed_in_prometheus_format(self):
+        self.client.get(BOOKS_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            'http_requests_total{method="GET",status="200",'
+            'view="books:book-list"}',
+            res.content.decode(),
+        )
+
+    def test_metrics_of_all_worker_processes_are_merged(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with mock.patch.dict(os.environ,
+                             {"PROMETHEUS_MULTIPROC_DIR": directory.name}):
+            # Two workers incrementing the same series.
+            for pid, amount in ((123, 2), (456, 3)):
+                counter = Counter("worker_jobs_total", "Test.",
+                                  ["worker"], registry=None)
+                value_class = values.MultiProcessValue(lambda: pid)
+                with mock.patch.object(values, "ValueClass", value_class):
+                    counter.labels("a").inc(amount)
+
+            res = self.client.get(METRICS_URL)
+
+        self.assertIn('worker_jobs_total{worker="a"} 5.0',
+                      res.content.decode())
+
+    def test_metrics_are_not_public(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        self.client.force_login(get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        ))
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_scraper_token(self):
+        self.client.logout()
+
+        res = self.client.get(METRICS_URL,
+                              HTTP_AUTHORIZATION="Bearer scrape-token")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer nope")
+        self.assertEqual(res.status_code, 403)
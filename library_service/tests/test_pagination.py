@@ -0,0 +1,48 @@
+import base64
+from urllib.parse import urlencode
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from books.tests.factories import sample_book
+
+BOOKS_URL = reverse("books:book-list")
+
+
+def cursor(position, reverse=False):
+    """Encode a cursor the way CursorPagination.encode_cursor does."""
+    query = urlencode({"r": int(reverse), "p": position})
+    return base64.b64encode(query.encode("ascii")).decode("ascii")
+
+
+class KeysetCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.books = [sample_book(total_loans=loans) for loans in (3, 1, 3)]
+
+    def get(self, position, **params):
+        return self.client.get(BOOKS_URL,
+                               {"cursor": cursor(position), **params})
+
+    def test_position_holds_every_ordering_field(self):
+        res = self.get(f'["3","{self.books[2].id}"]',
+                       ordering="-total_loans")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([book["id"] for book in res.json()["results"]],
+                         [self.books[0].id, self.books[1].id])
+
+    def test_tampered_positions_are_invalid_cursors(self):
+        for position in ('["abc"]', "abc", "7", '"7"', "[7]", "{}",
+                         '["3"]', '["3","1","1"]', '["x","1"]',
+                         '["3",null]'):
+            with self.subTest(position=position):
+                res = self.get(position, ordering="-total_loans")
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+                self.assertEqual(res.json(), {"detail": "Invalid cursor"})
+
+    def test_tampered_search_rank_is_an_invalid_cursor(self):
+        res = self.get('["high","1"]', search="dune")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
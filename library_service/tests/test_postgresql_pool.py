@@ -0,0 +1,177 @@
+import copy
+import threading
+import unittest
+
+import psycopg2
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+    TRANSACTION_STATUS_UNKNOWN,
+)
+
+from library_service.postgresql.base import DatabaseWrapper
+from library_service.postgresql.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.status = TRANSACTION_STATUS_IDLE
+        self.broken = False
+        self.info = self
+
+    @property
+    def transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        if self.broken:
+            raise psycopg2.OperationalError
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        if self.broken:
+            raise psycopg2.OperationalError
+        return FakeCursor()
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql):
+        pass
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def make_pool(self, **options):
+        self.opened = []
+
+        def connect():
+            self.opened.append(FakeConnection())
+            return self.opened[-1]
+
+        return ConnectionPool(connect, **{"size": 2, **options})
+
+    def test_released_connections_are_reused(self):
+        pool = self.make_pool()
+
+        first = pool.acquire()
+        pool.release(first)
+
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_pool_is_bounded(self):
+        pool = self.make_pool(timeout=0.01)
+        held = [pool.acquire(), pool.acquire()]
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        pool.release(held[0])
+        self.assertIs(pool.acquire(), held[0])
+
+    def test_acquire_waits_for_a_release(self):
+        pool = self.make_pool(size=1, timeout=5)
+        held = pool.acquire()
+        threading.Timer(0.05, pool.release, [held]).start()
+
+        self.assertIs(pool.acquire(), held)
+
+    def test_open_transactions_are_rolled_back(self):
+        pool = self.make_pool()
+        held = pool.acquire()
+        held.status = TRANSACTION_STATUS_INTRANS
+
+        pool.release(held)
+
+        self.assertEqual(held.status, TRANSACTION_STATUS_IDLE)
+        self.assertIs(pool.acquire(), held)
+
+    def test_broken_connections_are_discarded(self):
+        pool = self.make_pool()
+        held = pool.acquire()
+        held.status = TRANSACTION_STATUS_UNKNOWN
+        held.broken = True
+
+        pool.release(held)
+
+        self.assertTrue(held.closed)
+        self.assertIsNot(pool.acquire(), held)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_idle_connections_are_checked_before_reuse(self):
+        pool = self.make_pool(check_after=0)
+        held = pool.acquire()
+        pool.release(held)
+        # The server went away while the connection was idle.
+        held.broken = True
+
+        self.assertIsNot(pool.acquire(), held)
+        self.assertTrue(held.closed)
+
+    def test_old_connections_are_replaced(self):
+        pool = self.make_pool(max_age=0)
+        held = pool.acquire()
+        pool.release(held)
+
+        self.assertIsNot(pool.acquire(), held)
+        self.assertTrue(held.closed)
+
+    def test_close_closes_idle_connections(self):
+        pool = self.make_pool()
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+
+        pool.close()
+
+        self.assertTrue(idle.closed)
+        self.assertFalse(busy.closed)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+class PooledDatabaseWrapperTests(TransactionTestCase):
+    def make_wrapper(self):
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict["POOL"] = {"SIZE": 1}
+        return DatabaseWrapper(settings_dict, alias="pool_test")
+
+    def tearDown(self):
+        DatabaseWrapper.close_pools()
+
+    def test_closed_connections_go_back_to_the_pool(self):
+        wrapper = self.make_wrapper()
+
+        wrapper.ensure_connection()
+        first = wrapper.connection
+        wrapper.close()
+        self.assertFalse(first.closed)
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertIs(wrapper.connection, first)
+        wrapper.close()
+
+    def test_transactions_do_not_leak_into_the_next_user(self):
+        wrapper = self.make_wrapper()
+
+        wrapper.set_autocommit(False)
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TEMPORARY TABLE pool_leak (id int)")
+        wrapper.close()
+
+        other = self.make_wrapper()
+        with other.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('pool_leak')")
+            self.assertIsNone(cursor.fetchone()[0])
+            self.assertTrue(other.get_autocommit())
+        other.close()
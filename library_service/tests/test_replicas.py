@@ -0,0 +1,215 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_service.replicas import (
+    ReplicaPinMiddleware,
+    ReplicaRouter,
+    cache_timeout,
+    is_pinned,
+    replica_alias,
+)
+
+BOOKS_URL = reverse("books:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+EXPORT_URL = reverse("borrowings:borrowing-export")
+ME_URL = reverse("user:manage")
+REPLICA = "replica"
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_MAX_LAG=7)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.addCleanup(replica_alias.reset, replica_alias.set(None))
+
+    def test_reads_follow_the_request(self):
+        self.assertIsNone(self.router.db_for_read(Book))
+        self.assertEqual(cache_timeout(), DEFAULT_TIMEOUT)
+
+        replica_alias.set(REPLICA)
+
+        self.assertEqual(self.router.db_for_read(Book), REPLICA)
+        self.assertEqual(cache_timeout(), 7)
+
+    def test_writes_go_to_the_primary(self):
+        replica_alias.set(REPLICA)
+        book = Book(title="Dune")
+        book._state.db = REPLICA
+
+        self.assertEqual(self.router.db_for_write(Book, instance=book),
+                         DEFAULT_DB_ALIAS)
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(self.router.allow_migrate(REPLICA, "books"), False)
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS,
+                                                    "books"))
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    """Runs against a second alias for the test database, standing in for
+    a replica."""
+    # Resolved in setUpClass, after the alias is added; naming it here
+    # would fail the test runner's checks.
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+        }
+        cls.addClassCleanup(cls.remove_replica)
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.book = Book.objects.create(title="Dune", author="Herbert",
+                                        cover="HARD", inventory=5,
+                                        daily_fee=1)
+
+    def book_queries(self, method, *args, **kwargs):
+        """Return the response and the aliases that read books."""
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                res = getattr(self.client, method)(*args, **kwargs)
+                if res.streaming:
+                    # Streamed bodies query while they are consumed.
+                    res.body = b"".join(res.streaming_content)
+
+        aliases = {
+            alias
+            for alias, context in ((DEFAULT_DB_ALIAS, primary),
+                                   (REPLICA, replica))
+            if any('"books_book"' in query["sql"]
+                   for query in context.captured_queries)
+        }
+        return res, aliases
+
+    def test_safe_requests_read_from_the_replica(self):
+        res, aliases = self.book_queries("get", BOOKS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["results"][0]["title"], "Dune")
+        self.assertEqual(aliases, {REPLICA})
+
+    def test_checkout_pins_the_user_to_the_primary(self):
+        self.client.force_authenticate(self.user)
+
+        res, aliases = self.book_queries("post", BORROWINGS_URL, {
+            "book": self.book.id,
+            "expected_return_date": timezone.now() + timedelta(days=3),
+        })
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(aliases, {DEFAULT_DB_ALIAS})
+
+        res, aliases = self.book_queries("get", BORROWINGS_URL)
+        self.assertEqual(len(res.json()["results"]), 1)
+        self.assertEqual(aliases, {DEFAULT_DB_ALIAS})
+
+        # Other users keep reading from the replica.
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("other@test.com", "pass")
+        )
+        _, aliases = self.book_queries("get", BORROWINGS_URL)
+        self.assertEqual(aliases, {REPLICA})
+
+    def test_pinned_reads_skip_catalog_cached_from_replicas(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(BORROWINGS_URL, {
+            "book": self.book.id,
+            "expected_return_date": timezone.now() + timedelta(days=3),
+        })
+        detail_url = reverse("books:book-detail", args=[self.book.id])
+
+        for url in (BOOKS_URL, detail_url):
+            # Another client caches the new catalog version from a
+            # replica, which may still be behind the checkout.
+            self.client.force_authenticate(None)
+            _, aliases = self.book_queries("get", url)
+            self.assertEqual(aliases, {REPLICA})
+
+            self.client.force_authenticate(self.user)
+            res, aliases = self.book_queries("get", url)
+            self.assertEqual(aliases, {DEFAULT_DB_ALIAS})
+
+        self.assertEqual(res.json()["inventory"], 4)
+
+    def test_export_streams_from_the_replica(self):
+        Borrowing.objects.create(
+            book=self.book, user=self.user,
+            expected_return_date=timezone.now() + timedelta(days=3),
+        )
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(self.user)
+
+        res, aliases = self.book_queries("get", EXPORT_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(b"Dune", res.body)
+        self.assertEqual(aliases, {REPLICA})
+
+    def test_pin_expires(self):
+        self.client.force_authenticate(self.user)
+
+        with override_settings(REPLICA_MAX_LAG=0.01):
+            self.client.patch(ME_URL, {"first_name": "Updated"})
+        time.sleep(0.05)
+
+        _, aliases = self.book_queries("get", BOOKS_URL)
+        self.assertEqual(aliases, {REPLICA})
+
+    def test_profile_update_pins_the_user(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.patch(ME_URL, {"first_name": "Updated"})
+        self.assertEqual(res.status_code, 200)
+
+        _, aliases = self.book_queries("get", BOOKS_URL + "?page_size=5")
+        self.assertEqual(aliases, {DEFAULT_DB_ALIAS})
+
+    def test_failed_writes_do_not_pin(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(BORROWINGS_URL, {"book": 0})
+        self.assertEqual(res.status_code, 400)
+
+        _, aliases = self.book_queries("get", BOOKS_URL)
+        self.assertEqual(aliases, {REPLICA})
+
+    async def test_pin_middleware_stays_async_under_asgi(self):
+        async def view(request):
+            return HttpResponse(status=201)
+
+        middleware = ReplicaPinMiddleware(view)
+        request = mock.Mock(method="POST", user=self.user)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(request)
+        self.assertTrue(is_pinned(self.user))
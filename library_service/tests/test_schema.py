@@ -0,0 +1,81 @@
+import gzip
+import json
+from unittest import mock
+
+import yaml
+from django.test import TestCase
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+
+from library_service import schema
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaViewTests(TestCase):
+    def setUp(self):
+        schema.generate_schema.cache_clear()
+        schema.get_document.cache_clear()
+        self.addCleanup(schema.generate_schema.cache_clear)
+        self.addCleanup(schema.get_document.cache_clear)
+
+    def test_schema_is_generated_once(self):
+        with mock.patch.object(SchemaGenerator, "get_schema",
+                               autospec=True,
+                               side_effect=SchemaGenerator.get_schema) as gen:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+            as_json = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertEqual(gen.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(yaml.safe_load(first.content),
+                         json.loads(as_json.content))
+        self.assertEqual(as_json["Content-Type"],
+                         "application/vnd.oai.openapi+json")
+
+    def test_schema_honours_view_annotations(self):
+        res = self.client.get(SCHEMA_URL)
+        document = yaml.safe_load(res.content)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res["Content-Disposition"],
+            'inline; filename="Library Service API.yaml"',
+        )
+        parameters = {
+            parameter["name"]
+            for parameter in document["paths"]["/api/borrowings/"]["get"][
+                "parameters"
+            ]
+        }
+        self.assertLessEqual({"is_active", "user_id", "overdue"}, parameters)
+        self.assertIn("jwtAuth", document["components"]["securitySchemes"])
+        self.assertNotIn("/api/schema/", document["paths"])
+
+    def test_revalidation_returns_not_modified(self):
+        res = self.client.get(SCHEMA_URL)
+        self.assertIn("no-cache", res["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            res = self.client.get(SCHEMA_URL,
+                                  HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+
+    def test_gzipped_when_accepted(self):
+        plain = self.client.get(SCHEMA_URL)
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+        self.assertEqual(res["ETag"], f"W/{plain['ETag']}")
+
+    def test_versioned_requests_are_generated(self):
+        res = self.client.get(SCHEMA_URL, {"version": "2.0"})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("(2.0)", yaml.safe_load(res.content)["info"]["version"])
+        self.assertEqual(schema.get_document.cache_info().currsize, 0)
@@ -3,16 +3,21 @@ from django.urls import path, include
 from drf_spectacular.views import (
     SpectacularSwaggerView,
     SpectacularRedocView,
-    SpectacularAPIView
 )
 
+from library_service.metrics import metrics_view
+from library_service.schema import CachedSchemaView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/user/", include("user.urls", namespace="user")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSchemaView.as_view(), name="schema"),
     path("api/books/", include("books.urls", namespace="books")),
     path("api/borrowings/", include("borrowings.urls",
                                     namespace="borrowings")),
+    path("api/analytics/", include("analytics.urls",
+                                   namespace="analytics")),
     path(
         "api/doc/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from profiling.models import QueryStat
+
+ORDERINGS = {
+    "total": F("total_time").desc(),
+    "mean": (F("total_time") / F("calls")).desc(),
+    "calls": F("calls").desc(),
+    "max": F("max_time").desc(),
+    "slow": F("slow_calls").desc(),
+}
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Show the SQL statements of sampled requests with their call "
+        "sites, slowest first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--order-by", choices=ORDERINGS,
+                            default="total")
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--call-site",
+                            help="Only call sites containing this text.")
+        parser.add_argument("--reset", action="store_true",
+                            help="Delete the collected statistics.")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            deleted, _ = QueryStat.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} statements.")
+            return
+
+        stats = QueryStat.objects.order_by(ORDERINGS[options["order_by"]],
+                                           "key")
+        if options["call_site"]:
+            stats = stats.filter(call_site__contains=options["call_site"])
+
+        self.stdout.write(
+            f"{'calls':>8}{'total ms':>11}{'mean ms':>10}{'max ms':>10}"
+            f"{'slow':>6}  call site / statement"
+        )
+        for stat in stats[:options["limit"]]:
+            self.stdout.write(
+                f"{stat.calls:>8}{stat.total_time * 1000:>11.1f}"
+                f"{stat.total_time / stat.calls * 1000:>10.2f}"
+                f"{stat.max_time * 1000:>10.1f}{stat.slow_calls:>6}  "
+                f"{stat.call_site}\n{'':>47}{stat.fingerprint[:200]}"
+            )
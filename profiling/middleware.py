@@ -0,0 +1,74 @@
+import logging
+import random
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.utils import timezone
+
+from library_service.query_wrappers import query_wrapper
+from profiling.models import QueryStat
+from profiling.sql import SQLProfiler, project_packages
+
+logger = logging.getLogger(__name__)
+
+
+class SQLProfilingMiddleware:
+    """Profile the SQL of a random ``SQL_PROFILE_SAMPLE_RATE`` share of
+    requests, see ``profiling.sql.SQLProfiler``.
+
+    Totals are added to ``QueryStat`` after each sampled response and
+    read with ``manage.py sql_profile``. With a sample rate of 0 Django
+    drops the middleware at startup, so profiling costs nothing.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.SQL_PROFILE_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.slow_threshold = settings.SQL_SLOW_QUERY_MS / 1000
+        self.packages = project_packages()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profiler = SQLProfiler(self.packages, self.slow_threshold)
+        with query_wrapper(profiler):
+            response = self.get_response(request)
+
+        self.store(profiler)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        profiler = SQLProfiler(self.packages, self.slow_threshold)
+        with query_wrapper(profiler):
+            response = await self.get_response(request)
+
+        await sync_to_async(self.store)(profiler)
+        return response
+
+    def store(self, profiler):
+        if profiler.stats:
+            try:
+                QueryStat.objects.record(profiler.stats, timezone.now())
+            except DatabaseError:
+                logger.exception("Could not store the SQL profile.")
@@ -0,0 +1,27 @@
+# Generated by Django 4.0.4 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryStat',
+            fields=[
+                ('key', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('fingerprint', models.TextField()),
+                ('call_site', models.CharField(max_length=255)),
+                ('calls', models.PositiveBigIntegerField()),
+                ('total_time', models.FloatField()),
+                ('max_time', models.FloatField()),
+                ('slow_calls', models.PositiveBigIntegerField()),
+                ('last_seen', models.DateTimeField()),
+            ],
+        ),
+    ]
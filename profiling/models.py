@@ -0,0 +1,50 @@
+from django.db import connections, models, router
+
+
+class QueryStatManager(models.Manager):
+    def record(self, stats, now):
+        """Add the sampled ``stats`` to the stored totals.
+
+        ``stats`` maps a key to ``(fingerprint, call site, calls, total
+        time, max time, slow calls)``. Every entry is one upsert, sent in
+        a single ``executemany``, so concurrent workers add up correctly.
+        """
+        connection = connections[router.db_for_write(self.model)]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        key_column = connection.ops.quote_name("key")
+        sql = (
+            f"INSERT INTO {table} ({key_column}, fingerprint, call_site, "
+            f"calls, total_time, max_time, slow_calls, last_seen) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+            f"ON CONFLICT ({key_column}) DO UPDATE SET "
+            f"calls = {table}.calls + excluded.calls, "
+            f"total_time = {table}.total_time + excluded.total_time, "
+            f"max_time = CASE WHEN excluded.max_time > {table}.max_time "
+            f"THEN excluded.max_time ELSE {table}.max_time END, "
+            f"slow_calls = {table}.slow_calls + excluded.slow_calls, "
+            f"last_seen = excluded.last_seen"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [
+                (key, *values, now) for key, values in stats.items()
+            ])
+
+
+class QueryStat(models.Model):
+    """Totals of one normalized SQL statement run from one call site, in
+    sampled requests."""
+    key = models.CharField(max_length=32, primary_key=True)
+    fingerprint = models.TextField()
+    call_site = models.CharField(max_length=255)
+    calls = models.PositiveBigIntegerField()
+    # Seconds.
+    total_time = models.FloatField()
+    max_time = models.FloatField()
+    slow_calls = models.PositiveBigIntegerField()
+    last_seen = models.DateTimeField()
+
+    objects = QueryStatManager()
+
+    def __str__(self):
+        return f"{self.call_site}: {self.fingerprint[:50]}"
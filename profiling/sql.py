@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NORMALIZE = (
+    (STRING_LITERAL, "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    # IN lists and multi-row VALUES differ in length only.
+    (re.compile(r"\(\?(?:, \?)*\)"), "(...)"),
+    (re.compile(r"\(\.\.\.\)(?:, \(\.\.\.\))+"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+ORM_MODULE = "django.db."
+EXPLAINED = ("SELECT", "WITH")
+
+
+def fingerprint(sql):
+    """Return ``sql`` with literals and parameters replaced by ``?``, so
+    runs of one statement with different values share a fingerprint."""
+    for pattern, replacement in NORMALIZE:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def project_packages():
+    base_dir = Path(settings.BASE_DIR).resolve()
+    packages = {
+        config.name.split(".")[0]
+        for config in apps.get_app_configs()
+        if base_dir in Path(config.path).resolve().parents
+    }
+    packages.add(settings.ROOT_URLCONF.split(".")[0])
+    return frozenset(packages)
+
+
+def call_site(packages, frame):
+    """Name the function that ran the query: the innermost frame in the
+    project's own apps, else the innermost one outside the ORM (e.g. in
+    the admin). Querysets run where they are evaluated, so a queryset
+    built in ``get_queryset`` is reported at the code iterating it."""
+    fallback = None
+    # Frames up to the ORM belong to execute wrappers.
+    in_wrappers = True
+
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(ORM_MODULE):
+            in_wrappers = False
+        elif not in_wrappers:
+            name = f"{module}:{frame.f_code.co_qualname}"
+            if module.split(".")[0] in packages:
+                return name
+            if fallback is None:
+                fallback = name
+        frame = frame.f_back
+
+    return fallback or "<unknown>"
+
+
+class SQLProfiler:
+    """``connection.execute_wrapper`` that times every statement of a
+    request, grouped by fingerprint and call site, and logs the ones
+    slower than ``slow_threshold`` seconds with their query plan."""
+
+    def __init__(self, packages, slow_threshold, explain=True):
+        self.packages = packages
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self.stats = {}
+        self.busy = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.busy:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+
+        self.busy = True
+        try:
+            self.record(sql, params, many, context, duration)
+        finally:
+            self.busy = False
+
+        return result
+
+    def record(self, sql, params, many, context, duration):
+        statement = fingerprint(sql)
+        site = call_site(self.packages, sys._getframe())
+        key = hashlib.md5(f"{site}\n{statement}".encode()).hexdigest()
+        slow = duration >= self.slow_threshold
+
+        calls, total, longest, slow_calls = self.stats.get(
+            key, (statement, site, 0, 0.0, 0.0, 0)
+        )[2:]
+        self.stats[key] = (statement, site, calls + 1, total + duration,
+                           max(longest, duration), slow_calls + slow)
+
+        if slow:
+            connection = context["connection"]
+            plan = None
+            if self.explain and not many:
+                plan = self.query_plan(connection, sql, params)
+            # Parameters can hold emails, password hashes or tokens, so
+            # only the fingerprint is logged.
+            logger.warning(
+                "Slow query (%.1f ms) at %s on %s: %s\nPlan:\n%s",
+                duration * 1000, site, connection.alias, statement,
+                plan or "(not explained)",
+            )
+
+    def query_plan(self, connection, sql, params):
+        if not sql.lstrip().upper().startswith(EXPLAINED):
+            return None
+
+        prefix = connection.ops.explain_query_prefix()
+        try:
+            # A savepoint keeps a failing EXPLAIN from breaking the
+            # request's transaction.
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{prefix} {sql}", params)
+                    rows = cursor.fetchall()
+        except DatabaseError:
+            logger.exception("Could not explain the query.")
+            return None
+
+        # Plans quote the parameters in their conditions.
+        return STRING_LITERAL.sub("'?'", "\n".join(
+            " ".join(str(column) for column in row) for row in rows
+        ))
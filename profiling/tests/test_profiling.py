@@ -0,0 +1,198 @@
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from books.models import Book
+from books.tests.factories import sample_book
+from profiling.middleware import SQLProfilingMiddleware
+from profiling.models import QueryStat
+from profiling.sql import SQLProfiler, fingerprint, project_packages
+
+BOOKS_URL = reverse("books:book-list")
+
+
+def count_books():
+    return Book.objects.filter(inventory__gt=2).count()
+
+
+class FingerprintTests(TestCase):
+    def test_values_are_replaced(self):
+        self.assertEqual(
+            fingerprint(
+                "SELECT  *\n  FROM book WHERE title = 'It''s' "
+                "AND fee > 2.5 AND id = %s LIMIT 21"
+            ),
+            "SELECT * FROM book WHERE title = ? AND fee > ? AND id = ? "
+            "LIMIT ?",
+        )
+
+    def test_lists_of_any_length_share_a_fingerprint(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM book WHERE id IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM book WHERE id IN (%s)"),
+        )
+        self.assertEqual(
+            fingerprint("INSERT INTO book (a, b) VALUES (%s, %s), (%s, %s)"),
+            "INSERT INTO book (a, b) VALUES (...)",
+        )
+
+    def test_identifiers_keep_their_digits(self):
+        self.assertEqual(fingerprint('SELECT "t1"."id" FROM t1'),
+                         'SELECT "t1"."id" FROM t1')
+
+
+class SQLProfilerTests(TestCase):
+    def setUp(self):
+        sample_book()
+
+    def profile(self, function, slow_threshold=1):
+        profiler = SQLProfiler(project_packages(), slow_threshold)
+        with connection.execute_wrapper(profiler):
+            function()
+        return profiler
+
+    def test_statements_are_grouped_by_fingerprint_and_call_site(self):
+        def run_twice():
+            count_books()
+            count_books()
+
+        profiler = self.profile(run_twice)
+
+        [(statement, site, calls, total, longest, slow)] = (
+            profiler.stats.values()
+        )
+        self.assertIn('FROM "books_book"', statement)
+        self.assertEqual(site, f"{__name__}:count_books")
+        self.assertEqual(calls, 2)
+        self.assertGreaterEqual(total, longest)
+        self.assertEqual(slow, 0)
+
+    def test_slow_queries_are_logged_with_their_plan(self):
+        with self.assertLogs("profiling.sql", "WARNING") as logs:
+            profiler = self.profile(count_books, slow_threshold=0)
+
+        [log] = logs.output
+        self.assertIn(f"at {__name__}:count_books", log)
+        self.assertIn("Plan:\n", log)
+        self.assertNotIn("(not explained)", log)
+        [stats] = profiler.stats.values()
+        self.assertEqual(stats[5], 1)
+
+    def test_parameters_are_not_logged(self):
+        def find_by_token():
+            return Book.objects.filter(title="s3cret-token").count()
+
+        with self.assertLogs("profiling.sql", "WARNING") as logs:
+            self.profile(find_by_token, slow_threshold=0)
+
+        [log] = logs.output
+        self.assertNotIn("s3cret-token", log)
+        self.assertIn("Plan:\n", log)
+
+    def test_writes_are_not_explained(self):
+        with self.assertLogs("profiling.sql", "WARNING") as logs:
+            self.profile(lambda: sample_book(title="Emma"), slow_threshold=0)
+
+        self.assertIn("(not explained)", logs.output[-1])
+
+
+class QueryStatTests(TestCase):
+    def test_record_adds_to_the_stored_totals(self):
+        now = timezone.now()
+        QueryStat.objects.record(
+            {"k": ("SELECT ?", "books.views:f", 2, 0.5, 0.3, 1)}, now
+        )
+        QueryStat.objects.record(
+            {"k": ("SELECT ?", "books.views:f", 1, 0.25, 0.25, 0)}, now
+        )
+
+        stat = QueryStat.objects.get()
+        self.assertEqual(
+            (stat.calls, stat.total_time, stat.max_time, stat.slow_calls),
+            (3, 0.75, 0.3, 1),
+        )
+
+
+class SQLProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        sample_book()
+
+    @override_settings(SQL_PROFILE_SAMPLE_RATE=0)
+    def test_disabled_middleware_is_dropped(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            SQLProfilingMiddleware(lambda request: None)
+
+    @override_settings(SQL_PROFILE_SAMPLE_RATE=1)
+    def test_sampled_requests_are_stored(self):
+        res = self.client.get(BOOKS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        stats = QueryStat.objects.all()
+        self.assertTrue(stats.filter(fingerprint__contains='"books_book"'))
+        self.assertFalse(stats.exclude(call_site__regex=r"^[\w.]+:[\w.<>]+$"))
+
+    @override_settings(SQL_PROFILE_SAMPLE_RATE=1)
+    async def test_async_requests_are_stored(self):
+        res = await self.async_client.get(BOOKS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        # Run in a worker thread, still profiled.
+        stored = QueryStat.objects.filter(fingerprint__contains='"books_book"')
+        self.assertTrue(await sync_to_async(stored.exists)())
+
+    @override_settings(SQL_PROFILE_SAMPLE_RATE=1)
+    def test_middleware_stays_async_under_asgi(self):
+        async def view(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(SQLProfilingMiddleware(view)))
+
+    @override_settings(SQL_PROFILE_SAMPLE_RATE=0.5)
+    def test_other_requests_are_not_profiled(self):
+        with mock.patch("profiling.middleware.random.random",
+                        return_value=0.5):
+            self.client.get(BOOKS_URL)
+
+        self.assertFalse(QueryStat.objects.exists())
+
+
+class SQLProfileCommandTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        QueryStat.objects.record({
+            "a": ("SELECT ? FROM book", "books.views:BookViewSet.list",
+                  10, 0.1, 0.02, 0),
+            "b": ("UPDATE book SET a = ?", "borrowings.serializers:create",
+                  1, 0.5, 0.5, 1),
+        }, now)
+
+    def sql_profile(self, *args):
+        out = StringIO()
+        call_command("sql_profile", *args, stdout=out)
+        return out.getvalue()
+
+    def test_slowest_statements_come_first(self):
+        output = self.sql_profile()
+
+        self.assertLess(output.index("borrowings.serializers:create"),
+                        output.index("books.views:BookViewSet.list"))
+        self.assertIn("UPDATE book SET a = ?", output)
+
+    def test_order_and_filter(self):
+        output = self.sql_profile("--order-by", "calls")
+        self.assertLess(output.index("books.views"),
+                        output.index("borrowings.serializers"))
+
+        output = self.sql_profile("--call-site", "borrowings")
+        self.assertNotIn("books.views", output)
+
+    def test_reset(self):
+        self.assertIn("Deleted 2 statements.", self.sql_profile("--reset"))
+        self.assertFalse(QueryStat.objects.exists())
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.settings import api_settings
+
+from throttling.models import ThrottleBucket
+
+
+def longest_period():
+    """Seconds a bucket of the configured throttles takes to refill."""
+    durations = [
+        throttle().duration
+        for throttle in api_settings.DEFAULT_THROTTLE_CLASSES
+    ]
+    return max(filter(None, durations), default=0)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Delete throttle buckets idle long enough to be full again, e.g. "
+        "the one left behind by every anonymous IP address."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than", type=float,
+            help="Idle seconds, defaults to the longest throttle period.",
+        )
+
+    def handle(self, *args, **options):
+        older_than = options["older_than"]
+        if older_than is None:
+            older_than = longest_period()
+
+        deleted = ThrottleBucket.objects.prune(time.time() - older_than)
+
+        self.stdout.write(
+            f"Deleted {deleted} throttle buckets idle for more than "
+            f"{older_than:g}s."
+        )
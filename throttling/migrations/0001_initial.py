@@ -0,0 +1,23 @@
+# Generated by Django 4.0.4 on 2026-10-18 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('tokens', models.FloatField()),
+                ('allowed', models.BooleanField()),
+                ('updated_at', models.FloatField()),
+            ],
+        ),
+    ]
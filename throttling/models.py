@@ -0,0 +1,65 @@
+from django.db import connections, models, router
+
+
+class ThrottleBucketManager(models.Manager):
+    def take_token(self, key, capacity, period, now):
+        """Atomically take one token from the bucket stored under ``key``.
+
+        The bucket holds up to ``capacity`` tokens and refills at
+        ``capacity / period`` tokens per second. Refill, take and the
+        decision happen in a single upsert, so concurrent workers share
+        one counter and each call is one round trip. Returns
+        ``(allowed, tokens left)``.
+        """
+        connection = connections[router.db_for_write(self.model)]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        key_column = connection.ops.quote_name("key")
+        capacity = float(capacity)
+        rate = capacity / period
+        # Stored columns are qualified, Postgres finds bare names ambiguous
+        # next to "excluded".
+        elapsed = f"(excluded.updated_at - {table}.updated_at)"
+        available = f"({table}.tokens + {elapsed} * {rate!r})"
+        refilled = (
+            f"(CASE WHEN {available} > {capacity!r} THEN {capacity!r}"
+            f" ELSE {available} END)"
+        )
+        sql = (
+            f"INSERT INTO {table} ({key_column}, tokens, allowed, updated_at) "
+            f"VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT ({key_column}) DO UPDATE SET "
+            f"tokens = CASE WHEN {refilled} >= 1 "
+            f"THEN {refilled} - 1 ELSE {refilled} END, "
+            f"allowed = {refilled} >= 1, "
+            f"updated_at = excluded.updated_at "
+            f"RETURNING allowed, tokens"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [key, capacity - 1, True, now])
+            allowed, tokens = cursor.fetchone()
+
+        return bool(allowed), tokens
+
+    def prune(self, before):
+        """Delete buckets last used before the ``before`` timestamp.
+
+        A bucket idle for a whole period is full again, the same as no
+        bucket, so pruning with ``before`` at least the longest throttle
+        period ago changes no decision. Returns the number deleted.
+        """
+        deleted, _ = self.filter(updated_at__lt=before).delete()
+        return deleted
+
+
+class ThrottleBucket(models.Model):
+    key = models.CharField(max_length=255, primary_key=True)
+    tokens = models.FloatField()
+    allowed = models.BooleanField()
+    # Unix timestamp of the last request, compared with the request clock.
+    updated_at = models.FloatField()
+
+    objects = ThrottleBucketManager()
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,154 @@
+import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from throttling.models import ThrottleBucket
+from throttling.throttles import (
+    AnonTokenBucketThrottle,
+    UserTokenBucketThrottle,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ThreePerMinuteThrottle(UserTokenBucketThrottle):
+    rate = "3/min"
+
+
+class TakeTokenTests(TestCase):
+    def test_bucket_allows_capacity_then_denies(self):
+        results = [
+            ThrottleBucket.objects.take_token("key", 3, 60, 100.0)[0]
+            for _ in range(4)
+        ]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_bucket_refills_over_time(self):
+        for _ in range(3):
+            ThrottleBucket.objects.take_token("key", 3, 60, 100.0)
+
+        self.assertFalse(
+            ThrottleBucket.objects.take_token("key", 3, 60, 110.0)[0]
+        )
+        self.assertTrue(
+            ThrottleBucket.objects.take_token("key", 3, 60, 120.0)[0]
+        )
+
+    def test_bucket_does_not_exceed_capacity(self):
+        ThrottleBucket.objects.take_token("key", 3, 60, 100.0)
+
+        allowed, tokens = ThrottleBucket.objects.take_token(
+            "key", 3, 60, 100.0 + 3600
+        )
+
+        self.assertTrue(allowed)
+        self.assertEqual(tokens, 2)
+
+    def test_buckets_are_independent(self):
+        for _ in range(3):
+            ThrottleBucket.objects.take_token("first", 3, 60, 100.0)
+
+        self.assertTrue(
+            ThrottleBucket.objects.take_token("second", 3, 60, 100.0)[0]
+        )
+
+
+    def test_prune_deletes_idle_buckets(self):
+        ThrottleBucket.objects.take_token("idle", 3, 60, 100.0)
+        ThrottleBucket.objects.take_token("recent", 3, 60, 200.0)
+
+        self.assertEqual(ThrottleBucket.objects.prune(before=150.0), 1)
+        self.assertEqual(
+            list(ThrottleBucket.objects.values_list("key", flat=True)),
+            ["recent"],
+        )
+
+
+class PruneThrottleBucketsCommandTests(TestCase):
+    def test_prunes_buckets_idle_for_the_longest_period(self):
+        now = time.time()
+        ThrottleBucket.objects.take_token("idle", 3, 60, now - 90000)
+        ThrottleBucket.objects.take_token("recent", 3, 60, now - 3600)
+        out = StringIO()
+
+        call_command("prune_throttle_buckets", stdout=out)
+
+        self.assertIn("Deleted 1 throttle buckets idle for more than "
+                      "86400s.", out.getvalue())
+        self.assertTrue(ThrottleBucket.objects.filter(key="recent").exists())
+
+    def test_older_than(self):
+        ThrottleBucket.objects.take_token("key", 3, 60, time.time() - 120)
+
+        call_command("prune_throttle_buckets", "--older-than", "60",
+                     stdout=StringIO())
+
+        self.assertFalse(ThrottleBucket.objects.exists())
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.clock = Clock()
+
+    def make_request(self, user=None):
+        request = Request(APIRequestFactory().get("/"))
+        if user is not None:
+            request.user = user
+        return request
+
+    def allow(self, throttle_class, request):
+        throttle = throttle_class()
+        throttle.timer = self.clock
+        return throttle.allow_request(request, None), throttle
+
+    def test_user_is_throttled_after_rate(self):
+        request = self.make_request(self.user)
+
+        results = [
+            self.allow(ThreePerMinuteThrottle, request)[0] for _ in range(4)
+        ]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_wait_until_next_token(self):
+        request = self.make_request(self.user)
+        for _ in range(3):
+            self.allow(ThreePerMinuteThrottle, request)
+
+        allowed, throttle = self.allow(ThreePerMinuteThrottle, request)
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 20)
+
+        self.clock.now += 20
+        self.assertTrue(self.allow(ThreePerMinuteThrottle, request)[0])
+
+    def test_anon_throttle_ignores_authenticated_users(self):
+        request = self.make_request(self.user)
+
+        with self.assertNumQueries(0):
+            allowed, _ = self.allow(AnonTokenBucketThrottle, request)
+
+        self.assertTrue(allowed)
+
+    def test_throttle_is_a_single_query(self):
+        request = self.make_request(self.user)
+
+        with self.assertNumQueries(1):
+            self.allow(UserTokenBucketThrottle, request)
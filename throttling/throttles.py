@@ -0,0 +1,44 @@
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+from throttling.models import ThrottleBucket
+
+
+class TokenBucketRateThrottle(SimpleRateThrottle):
+    """Rate throttle whose state is shared by every worker through the
+    database instead of the per-process cache.
+
+    The configured rate (e.g. "300/day") becomes a bucket of 300 tokens
+    refilled evenly over a day, so clients can burst up to the limit and
+    then continue at the average rate.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.allowed, self.tokens = ThrottleBucket.objects.take_token(
+            self.key, self.num_requests, self.duration, self.timer()
+        )
+        return self.allowed
+
+    def wait(self):
+        if self.allowed:
+            return None
+
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class AnonTokenBucketThrottle(TokenBucketRateThrottle, AnonRateThrottle):
+    pass
+
+
+class UserTokenBucketThrottle(TokenBucketRateThrottle, UserRateThrottle):
+    pass
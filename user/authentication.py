@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+# What authentication and permissions read, never the password hash.
+CACHED_USER_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser")
+
+
+def user_cache_key(user_id):
+    return f"auth:user-fields:{user_id}"
+
+
+def evict_cached_user(user_id):
+    """Drop a cached user now and again once the transaction commits, so
+    a request racing the write cannot cache the old row for long."""
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that resolves the token's user through a
+    short-lived cache instead of a query on every request.
+
+    Only ``CACHED_USER_FIELDS`` are cached, and later requests get an
+    unsaved user rebuilt from them.
+
+    Saving a user (e.g. a password change or a deactivation) or deleting
+    it evicts it, in every worker as long as they
+    share the default cache (``manage.py check --deploy`` requires it).
+    ``QuerySet.update()`` and raw SQL send no signal, so changes made that
+    way apply within ``AUTH_USER_CACHE_TIMEOUT`` seconds.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        fields = cache.get(key)
+
+        if fields is not None:
+            # Unsaved, views that change the user load it themselves.
+            return self.user_model(**fields)
+
+        user = super().get_user(validated_token)
+        cache.set(
+            key,
+            {field: getattr(user, field) for field in CACHED_USER_FIELDS},
+            settings.AUTH_USER_CACHE_TIMEOUT,
+        )
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Document the cached authentication as the JWT bearer scheme it
+    is."""
+    target_class = CachedJWTAuthentication
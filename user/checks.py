@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_user_cache(app_configs, **kwargs):
+    """Authenticated users are cached in the default cache and evicted
+    when saved, which only reaches the other workers through a cache they
+    share."""
+    backend = settings.CACHES[DEFAULT_CACHE_ALIAS]["BACKEND"]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [
+        Error(
+            "The default cache is local to each process, so a deactivated "
+            "or demoted user stays authenticated in the other workers for "
+            "up to AUTH_USER_CACHE_TIMEOUT seconds.",
+            hint="Set CACHE_BACKEND to a cache shared by the workers, e.g. "
+                 "FileBasedCache or DatabaseCache.",
+            id="user.E001",
+        )
+    ]
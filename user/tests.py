@@ -1,3 +1,124 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import CACHED_USER_FIELDS, user_cache_key
+from user.checks import check_user_cache
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+ME_URL = reverse("user:manage")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZE=f"Bearer {token}")
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url)
+
+        return res, [
+            query["sql"] for query in context.captured_queries
+            if 'FROM "user_user"' in query["sql"]
+        ]
+
+    def test_user_is_loaded_once(self):
+        res, first = self.user_queries(BORROWINGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first), 1)
+
+        res, second = self.user_queries(BORROWINGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(second, [])
+
+    def test_cache_holds_no_password_hash(self):
+        self.client.get(BORROWINGS_URL)
+        res = self.client.get(BORROWINGS_URL)
+
+        cached = cache.get(user_cache_key(self.user.id))
+        self.assertEqual(set(cached), set(CACHED_USER_FIELDS))
+        self.assertEqual(res.wsgi_request.user.id, self.user.id)
+        self.assertEqual(res.wsgi_request.user.password, "")
+
+    def test_profile_update_evicts_cached_user(self):
+        self.client.get(BORROWINGS_URL)
+
+        self.client.patch(ME_URL, {"first_name": "Updated"})
+        _, queries = self.user_queries(BORROWINGS_URL)
+
+        self.assertEqual(len(queries), 1)
+
+    def test_staff_change_is_visible(self):
+        self.client.get(BORROWINGS_URL)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(BORROWINGS_URL)
+
+        self.assertEqual(res.wsgi_request.user.is_staff, True)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(BORROWINGS_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(BORROWINGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_queryset_update_applies_after_the_timeout(self):
+        # No post_save, so nothing evicts the cached user.
+        with override_settings(AUTH_USER_CACHE_TIMEOUT=0.05):
+            self.client.get(BORROWINGS_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+
+        res = self.client.get(BORROWINGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        time.sleep(0.1)
+        res = self.client.get(BORROWINGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_evicts_cached_user(self):
+        self.client.get(BORROWINGS_URL)
+
+        self.user.set_password("newpass")
+        self.user.save()
+        _, queries = self.user_queries(BORROWINGS_URL)
+
+        self.assertEqual(len(queries), 1)
+
+
+class UserCacheCheckTests(SimpleTestCase):
+    def test_process_local_cache_is_rejected(self):
+        with override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }}):
+            errors = check_user_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["user.E001"])
+
+    def test_shared_cache_passes(self):
+        with override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased."
+                       "FileBasedCache",
+            "LOCATION": "/tmp/library_service_test_cache",
+        }}):
+            self.assertEqual(check_user_cache(None), [])
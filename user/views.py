@@ -11,6 +11,8 @@ class CreateUserView(generics.CreateAPIView):
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
+    # Loads the user from the database: updates must never be applied to a
+    # cached copy.
     authentication_classes = (JWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 